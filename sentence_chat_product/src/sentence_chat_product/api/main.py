@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import asdict
 from functools import lru_cache
 from typing import Any
@@ -24,8 +28,6 @@ from sentence_chat_product.core.retrieval import RetrievalService
 from sentence_chat_product.core.types import SentenceCalculationInput
 from sentence_chat_product.db.repository import Repository
 
-app = FastAPI(title="Sentence Chat Product API", version="0.1.0")
-
 
 @lru_cache
 def get_repository() -> Repository:
@@ -33,6 +35,31 @@ def get_repository() -> Repository:
     return Repository(settings.database_url)
 
 
+async def flush_audit_periodically(repo: Repository) -> None:
+    # Writes only check the buffer's age when they arrive; a quiet server relies on this timer.
+    while True:
+        await asyncio.sleep(repo.audit_flush_interval_s)
+        await asyncio.to_thread(repo.flush_audit)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    repo = get_repository()
+    flusher = asyncio.create_task(flush_audit_periodically(repo))
+    try:
+        yield
+    finally:
+        flusher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await flusher
+        # Audit rows are buffered by the repository; write out whatever is left.
+        # flush_audit logs any rows it could not write.
+        repo.flush_audit()
+
+
+app = FastAPI(title="Sentence Chat Product API", version="0.1.0", lifespan=lifespan)
+
+
 @lru_cache
 def get_retrieval_service() -> RetrievalService:
     settings = get_settings()
@@ -12,6 +12,9 @@ from .rules import (
     victim_surcharge,
 )
 from .types import (
+    F_SEXUAL,
+    F_TERRORIST,
+    F_VIOLENT,
     SentenceCalculationInput,
     SentenceCalculationResult,
     SentencingRangeRecord,
@@ -69,7 +72,7 @@ def build_warnings(data: SentenceCalculationInput, pre_plea_term_months: float |
             "Mandatory life sentence route may be engaged for repeat listed offence; review SC283/SC273 conditions."
         )
 
-    if offence.specified_violent or offence.specified_sexual or offence.specified_terrorist:
+    if offence.flags & (F_VIOLENT | F_SEXUAL | F_TERRORIST):
         if data.dangerousness_assessed and has_life_maximum(offence):
             warnings.append(
                 "Dangerousness + specified offence + life max may trigger mandatory life provisions; review SC285/SC274/SC258."
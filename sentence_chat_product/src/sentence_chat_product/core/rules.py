@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import date
-
-from .types import OffenceRecord, SentenceCalculationInput
-
-PLEA_FACTORS: dict[str, float] = {
+from typing import Final
+
+from .types import (
+    F_LIFE_MAX,
+    F_SCH19ZA,
+    F_SEXUAL,
+    F_VIOLENT,
+    OffenceRecord,
+    SentenceCalculationInput,
+)
+
+PLEA_FACTORS: Final[dict[str, float]] = {
     "first_stage": 2.0 / 3.0,
     "after_first_stage_before_trial": 3.0 / 4.0,
     "day_of_trial": 9.0 / 10.0,
@@ -15,27 +24,36 @@ PLEA_FACTORS: dict[str, float] = {
     "not_guilty": 1.0,
 }
 
-CUSTODIAL_SENTENCE_TYPES = {
-    "determinate_custodial_sentence",
-    "dto",
-    "yoi_detention",
-    "extended_sentence",
-    "special_custodial_sentence",
-    "discretionary_life_sentence",
-    "mandatory_life_sentence",
+CUSTODIAL_SENTENCE_TYPES: Final[frozenset[str]] = frozenset(
+    {
+        "determinate_custodial_sentence",
+        "dto",
+        "yoi_detention",
+        "extended_sentence",
+        "special_custodial_sentence",
+        "discretionary_life_sentence",
+        "mandatory_life_sentence",
+    }
+)
+
+SUSPENDED_OR_NON_IMMEDIATE: Final[frozenset[str]] = frozenset({"suspended_sentence_order"})
+
+FIREARMS_START_DATES: Final[dict[str, date]] = {
+    "C1": date(2004, 1, 22),
+    "C2": date(2007, 4, 6),
+    "C3": date(2014, 7, 14),
+    "C4": date(1900, 1, 1),
 }
 
-SUSPENDED_OR_NON_IMMEDIATE = {"suspended_sentence_order"}
-
-SERIOUS_PROVISION_MARKERS = [
+SERIOUS_PROVISION_MARKERS: Final[tuple[str, ...]] = (
     "manslaughter",
     "soliciting to commit murder",
     "grievous bodily harm with intent",
     "wounding with intent",
     "gbh with intent",
-]
+)
 
-FORTY_PERCENT_EXCLUSIONS = [
+FORTY_PERCENT_EXCLUSIONS: Final[tuple[str, ...]] = (
     "serious crime act 2015 s.76",
     "serious crime act 2015 s.75a",
     "sentencing act 2020 s.363",
@@ -43,7 +61,7 @@ FORTY_PERCENT_EXCLUSIONS = [
     "domestic abuse act 2021 s.39",
     "national security act",
     "official secrets act",
-]
+)
 
 
 @dataclass(slots=True)
@@ -94,7 +112,7 @@ def is_immediate_custody(sentence_type: str) -> bool:
 
 
 def has_life_maximum(offence: OffenceRecord) -> bool:
-    return "life" in (offence.maximum_sentence_amount or "").lower()
+    return bool(offence.flags & F_LIFE_MAX)
 
 
 def plea_factor(stage: str) -> float:
@@ -105,7 +123,8 @@ def minimum_sentence_decision(data: SentenceCalculationInput) -> MinimumSentence
     if data.minimum_sentence_unjust_or_exceptional:
         return MinimumSentenceDecision(False, None, None, "minimum disapplied by input override")
 
-    code = (data.offence.minimum_sentence_code or "").strip().upper()
+    # Normalized (stripped, upper-cased) by OffenceRecord.__post_init__.
+    code = data.offence.minimum_sentence_code
     if not code:
         return MinimumSentenceDecision(False, None, None, None)
 
@@ -131,14 +150,8 @@ def minimum_sentence_decision(data: SentenceCalculationInput) -> MinimumSentence
             return MinimumSentenceDecision(True, floor_pre, floor_post, "Class A trafficking minimum")
         return MinimumSentenceDecision(False, None, None, "Conditions for B not met")
 
-    if code in {"C1", "C2", "C3", "C4"}:
-        starts = {
-            "C1": date(2004, 1, 22),
-            "C2": date(2007, 4, 6),
-            "C3": date(2014, 7, 14),
-            "C4": date(1900, 1, 1),
-        }
-        if data.offence_date < starts[code]:
+    if code in FIREARMS_START_DATES:
+        if data.offence_date < FIREARMS_START_DATES[code]:
             return MinimumSentenceDecision(False, None, None, "Firearms date threshold not met")
         if adult:
             return MinimumSentenceDecision(True, 60.0, 60.0, "Firearms adult minimum")
@@ -174,10 +187,8 @@ def minimum_sentence_decision(data: SentenceCalculationInput) -> MinimumSentence
     return MinimumSentenceDecision(False, None, None, f"Unsupported minimum code {code}")
 
 
-def is_forty_percent_regime(offence: OffenceRecord, term_months: float) -> bool:
-    if term_months > 48 and offence.specified_violent:
-        return False
-
+def _forty_percent_eligible(offence: OffenceRecord) -> bool:
+    """Term-independent part of the forty-percent regime test."""
     category = (offence.offence_category or "").lower()
     if "sexual offence" in category:
         return False
@@ -193,10 +204,17 @@ def is_forty_percent_regime(offence: OffenceRecord, term_months: float) -> bool:
     return True
 
 
-def release_decision(data: SentenceCalculationInput, post_plea_term_months: float | None) -> ReleaseDecision:
-    sentence_type = data.sentence_type
-    offence = data.offence
+def is_forty_percent_regime(offence: OffenceRecord, term_months: float) -> bool:
+    if term_months > 48 and offence.flags & F_VIOLENT:
+        return False
+    return _forty_percent_eligible(offence)
 
+
+def _sentence_type_release(
+    sentence_type: str,
+    post_plea_term_months: float | None,
+) -> ReleaseDecision | None:
+    """Release outcomes decided by sentence type alone; None means offence rules apply."""
     if sentence_type in {"mandatory_life_sentence", "discretionary_life_sentence"}:
         return ReleaseDecision(None, "Life sentence: release not represented as determinate fraction")
 
@@ -215,31 +233,72 @@ def release_decision(data: SentenceCalculationInput, post_plea_term_months: floa
     if not is_custodial(sentence_type):
         return ReleaseDecision(None, "Sentence type not treated as custodial")
 
-    term = post_plea_term_months
-    life_max = has_life_maximum(offence)
+    return None
 
-    if term >= 84 and life_max and (offence.specified_sexual or offence.specified_violent):
-        return ReleaseDecision(2.0 / 3.0, "Term >= 84m + life max + specified offence")
 
-    if offence.schedule19za or data.terrorism_flag:
-        return ReleaseDecision(2.0 / 3.0, "Schedule 19ZA / terrorism route")
+def compile_release_fn(
+    offence: OffenceRecord,
+) -> Callable[[SentenceCalculationInput, float | None], ReleaseDecision]:
+    """Build a release_decision specialised to one offence.
 
+    Everything that depends only on the offence (flags, provision markers, the
+    forty-percent exclusions) is evaluated once here; the returned closure only
+    branches on the sentence type, term and per-request flags.
+    """
+    flags = offence.flags
+    life_max = bool(flags & F_LIFE_MAX)
+    specified_life_max = life_max and bool(flags & (F_SEXUAL | F_VIOLENT))
+    sexual_life_max = life_max and bool(flags & F_SEXUAL)
+    schedule19za = bool(flags & F_SCH19ZA)
+    violent = bool(flags & F_VIOLENT)
     provision_or_name = f"{offence.provision} {offence.canonical_name}".lower()
-    if term >= 48:
-        if life_max and offence.specified_sexual:
-            return ReleaseDecision(2.0 / 3.0, "Sexual offence with life max and term >= 48m")
-        if any(marker in provision_or_name for marker in SERIOUS_PROVISION_MARKERS):
-            return ReleaseDecision(2.0 / 3.0, "Specified serious offence marker with term >= 48m")
-
-    forty_percent = is_forty_percent_regime(offence, term)
-    if data.replicate_ace_release_bug:
+    serious_marker = any(marker in provision_or_name for marker in SERIOUS_PROVISION_MARKERS)
+    forty_eligible = _forty_percent_eligible(offence)
+
+    def decide(
+        data: SentenceCalculationInput, post_plea_term_months: float | None
+    ) -> ReleaseDecision:
+        by_type = _sentence_type_release(data.sentence_type, post_plea_term_months)
+        if by_type is not None:
+            return by_type
+
+        assert post_plea_term_months is not None
+        term = post_plea_term_months
+        if specified_life_max and term >= 84:
+            return ReleaseDecision(2.0 / 3.0, "Term >= 84m + life max + specified offence")
+
+        if schedule19za or data.terrorism_flag:
+            return ReleaseDecision(2.0 / 3.0, "Schedule 19ZA / terrorism route")
+
+        if term >= 48:
+            if sexual_life_max:
+                return ReleaseDecision(2.0 / 3.0, "Sexual offence with life max and term >= 48m")
+            if serious_marker:
+                return ReleaseDecision(
+                    2.0 / 3.0, "Specified serious offence marker with term >= 48m"
+                )
+
+        forty_percent = forty_eligible and not (violent and term > 48)
+        if data.replicate_ace_release_bug:
+            if forty_percent:
+                return ReleaseDecision(
+                    0.5, "Replicating sentenceACE inconsistency for forty-percent regime"
+                )
+            return ReleaseDecision(
+                0.4, "Replicating sentenceACE inconsistency for non-forty-percent regime"
+            )
+
         if forty_percent:
-            return ReleaseDecision(0.5, "Replicating sentenceACE inconsistency for forty-percent regime")
-        return ReleaseDecision(0.4, "Replicating sentenceACE inconsistency for non-forty-percent regime")
+            return ReleaseDecision(0.4, "Forty-percent regime")
+        return ReleaseDecision(0.5, "Halfway release regime")
+
+    return decide
+
 
-    if forty_percent:
-        return ReleaseDecision(0.4, "Forty-percent regime")
-    return ReleaseDecision(0.5, "Halfway release regime")
+def release_decision(
+    data: SentenceCalculationInput, post_plea_term_months: float | None
+) -> ReleaseDecision:
+    return data.offence.release_fn(data, post_plea_term_months)
 
 
 def sentence_after_plea(
@@ -248,7 +307,7 @@ def sentence_after_plea(
 ) -> float | None:
     if pre_plea_term_months is None:
         return None
-    return round(pre_plea_term_months * plea_factor(stage), 2)
+    return round(pre_plea_term_months * PLEA_FACTORS.get(stage, 1.0), 2)
 
 
 def apply_minimum_sentence_floor(
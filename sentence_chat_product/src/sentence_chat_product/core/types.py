@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Literal
+from typing import Any, Literal, NamedTuple
 
 PleaStage = Literal[
     "first_stage",
@@ -29,9 +30,22 @@ SentenceType = Literal[
     "mandatory_life_sentence",
 ]
 
+# Bit flags packed into OffenceRecord.flags so rule checks can test several
+# offence markers with one integer mask.
+F_VIOLENT = 1
+F_SEXUAL = 2
+F_TERRORIST = 4
+F_LISTED = 8
+F_SCH18A = 16
+F_SCH19ZA = 32
+F_CTA = 64
+F_LIFE_MAX = 128
 
-@dataclass(slots=True)
+
+@dataclass(frozen=True, slots=True)
 class OffenceRecord:
+    """Catalog offence; frozen so derived fields stay in step (change with dataclasses.replace)."""
+
     offence_id: str
     canonical_name: str
     short_name: str
@@ -49,10 +63,34 @@ class OffenceRecord:
     schedule18a_offence: bool
     schedule19za: bool
     cta_notification: bool
+    flags: int = field(init=False, default=0, repr=False, compare=False)
+    # Offence-specialised release rule from rules.compile_release_fn.
+    release_fn: Callable[..., Any] = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        # Rules compare against upper-case codes ("A".."E").
+        code = (self.minimum_sentence_code or "").strip().upper()
+        object.__setattr__(self, "minimum_sentence_code", code)
+        flags = (
+            (F_VIOLENT if self.specified_violent else 0)
+            | (F_SEXUAL if self.specified_sexual else 0)
+            | (F_TERRORIST if self.specified_terrorist else 0)
+            | (F_LISTED if self.listed_offence else 0)
+            | (F_SCH18A if self.schedule18a_offence else 0)
+            | (F_SCH19ZA if self.schedule19za else 0)
+            | (F_CTA if self.cta_notification else 0)
+            | (F_LIFE_MAX if "life" in (self.maximum_sentence_amount or "").lower() else 0)
+        )
+        object.__setattr__(self, "flags", flags)
+        # Imported here because rules imports this module.
+        from sentence_chat_product.core.rules import compile_release_fn
+
+        object.__setattr__(self, "release_fn", compile_release_fn(self))
+
+
+class SentenceCalculationInput(NamedTuple):
+    """Per-request calculator input; immutable and tuple-backed."""
 
-@dataclass(slots=True)
-class SentenceCalculationInput:
     offence: OffenceRecord
     offence_date: date
     conviction_date: date
@@ -2,22 +2,134 @@
 
 from __future__ import annotations
 
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterator
 from contextlib import contextmanager
-from typing import Any, Iterator
+from datetime import UTC, datetime
+from typing import Any
 
 import psycopg
+from pgvector import Vector
 from pgvector.psycopg import register_vector
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 
 from sentence_chat_product.core.types import OffenceRecord
 
+logger = logging.getLogger(__name__)
+
+# Each retrieval stage (vector, full-text) contributes up to top_k * factor candidates.
+HYBRID_CANDIDATE_FACTOR = 4
+# pgvector's default and maximum hnsw.ef_search.
+HNSW_EF_SEARCH_MIN = 40
+HNSW_EF_SEARCH_MAX = 1000
+
+# Columns read by _to_offence_record; offence_catalog also carries wide payload columns.
+_OFFENCE_COLS = """
+  offence_id,
+  canonical_name,
+  short_name,
+  offence_category,
+  provision,
+  guideline_url,
+  legislation_url,
+  maximum_sentence_type,
+  maximum_sentence_amount,
+  minimum_sentence_code,
+  specified_violent,
+  specified_sexual,
+  specified_terrorist,
+  listed_offence,
+  schedule18a_offence,
+  schedule19za,
+  cta_notification
+"""
+
+
+class _LruCache:
+    """Thread-safe LRU cache with an optional per-entry TTL."""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_s: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            expired = (
+                entry is not None
+                and self.ttl_s is not None
+                and self.clock() - entry[0] > self.ttl_s
+            )
+            if entry is None or expired:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
 
 class Repository:
     """Thin repository around Postgres queries."""
 
-    def __init__(self, database_url: str):
+    def __init__(
+        self,
+        database_url: str,
+        audit_batch_size: int = 64,
+        audit_flush_interval_s: float = 5.0,
+        audit_buffer_max: int = 10_000,
+        offence_cache_size: int = 1024,
+        offence_cache_ttl_s: float = 3600.0,
+        matrix_cache_ttl_s: float = 300.0,
+        cache_clock: Callable[[], float] = time.monotonic,
+    ):
         self.database_url = database_url
+        self.audit_batch_size = audit_batch_size
+        self.audit_flush_interval_s = audit_flush_interval_s
+        self.audit_buffer_max = audit_buffer_max
+        self._audit_buffer: deque[tuple[str | None, Json, Json, datetime]] = deque()
+        self._audit_buffer_started = 0.0
+        self._audit_retry_at = 0.0
+        self._audit_lock = threading.Lock()
+        # Catalog rows change only on a reload; the TTL bounds staleness without an invalidate call.
+        self._offence_cache = _LruCache(
+            offence_cache_size, ttl_s=offence_cache_ttl_s, clock=cache_clock
+        )
+        self._matrix_cache = _LruCache(
+            offence_cache_size, ttl_s=matrix_cache_ttl_s, clock=cache_clock
+        )
 
     @contextmanager
     def connect(self) -> Iterator[psycopg.Connection]:
@@ -25,16 +137,32 @@ class Repository:
             register_vector(conn)
             yield conn
 
+    def invalidate(self, offence_id: str | None = None) -> None:
+        """Drop cached reference data for one offence, or everything when offence_id is None."""
+        self._offence_cache.invalidate(offence_id)
+        self._matrix_cache.invalidate(offence_id)
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        return {"offence": self._offence_cache.stats(), "matrix": self._matrix_cache.stats()}
+
     def fetch_offence_by_id(self, offence_id: str) -> OffenceRecord | None:
-        sql = "SELECT * FROM offence_catalog WHERE offence_id = %s::uuid"
+        cached = self._offence_cache.get(offence_id)
+        if cached is not None:
+            return cached
+
+        sql = f"SELECT {_OFFENCE_COLS} FROM offence_catalog WHERE offence_id = %s::uuid"
         with self.connect() as conn, conn.cursor() as cur:
             cur.execute(sql, (offence_id,))
             row = cur.fetchone()
-            return self._to_offence_record(row) if row else None
+        if not row:
+            return None
+        record = self._to_offence_record(row)
+        self._offence_cache.put(offence_id, record)
+        return record
 
     def search_offences(self, query: str, limit: int = 5) -> list[OffenceRecord]:
-        sql = """
-        SELECT *,
+        sql = f"""
+        SELECT {_OFFENCE_COLS},
           greatest(
             similarity(canonical_name, %(q)s),
             similarity(coalesce(short_name, ''), %(q)s),
@@ -45,11 +173,18 @@ class Repository:
         LIMIT %(limit)s;
         """
         with self.connect() as conn, conn.cursor() as cur:
-            cur.execute(sql, {"q": query, "limit": limit})
-            rows = cur.fetchall()
-        return [self._to_offence_record(row) for row in rows if row]
+            return [
+                self._to_offence_record(row)
+                for row in cur.stream(sql, {"q": query, "limit": limit})
+                if row
+            ]
 
     def fetch_sentencing_matrix(self, offence_id: str) -> list[dict[str, Any]]:
+        cached = self._matrix_cache.get(offence_id)
+        if cached is not None:
+            # Fresh dicts each call, so a caller editing rows cannot change the cache.
+            return [dict(row) for row in cached]
+
         sql = """
         SELECT DISTINCT ON (sm.matrix_id)
           sm.matrix_id::text,
@@ -67,8 +202,9 @@ class Repository:
         ORDER BY sm.matrix_id, sm.guideline_id;
         """
         with self.connect() as conn, conn.cursor() as cur:
-            cur.execute(sql, {"offence_id": offence_id})
-            return [dict(row) for row in cur.fetchall()]
+            rows = list(cur.stream(sql, {"offence_id": offence_id}))
+        self._matrix_cache.put(offence_id, tuple(dict(row) for row in rows))
+        return rows
 
     def search_guideline_chunks(
         self,
@@ -98,7 +234,50 @@ class Repository:
         offence_id: str | None,
         query_embedding: list[float],
     ) -> list[dict[str, Any]]:
+        # Candidate generation runs as two index-ordered scans (ANN on the embedding,
+        # GIN on the tsvector); only their union is scored and re-ranked.
         sql = """
+        WITH q AS (
+          SELECT plainto_tsquery('english', %(query)s) AS tsq
+        ),
+        scope AS NOT MATERIALIZED (
+          SELECT gc.chunk_id, gc.embedding, gc.tsv
+          FROM guideline_chunks gc
+          WHERE (
+            %(offence_id)s::uuid IS NULL
+            OR gc.offence_id = %(offence_id)s::uuid
+            OR gc.guideline_id IN (
+              SELECT guideline_id
+              FROM offence_guideline_links
+              WHERE offence_id = %(offence_id)s::uuid
+            )
+          )
+        ),
+        vector_candidates AS (
+          (
+            SELECT s.chunk_id
+            FROM scope s
+            WHERE NOT %(exact_vector)s AND s.embedding IS NOT NULL
+            ORDER BY s.embedding <=> %(embedding)b::vector
+            LIMIT %(candidate_k)s
+          )
+          UNION ALL
+          (
+            -- "+ 0" keeps the planner off the HNSW index: an exact ordering of the scope.
+            SELECT s.chunk_id
+            FROM scope s
+            WHERE %(exact_vector)s AND s.embedding IS NOT NULL
+            ORDER BY (s.embedding <=> %(embedding)b::vector) + 0
+            LIMIT %(candidate_k)s
+          )
+        ),
+        text_candidates AS (
+          SELECT s.chunk_id
+          FROM scope s, q
+          WHERE s.tsv @@ q.tsq
+          ORDER BY ts_rank_cd(s.tsv, q.tsq) DESC
+          LIMIT %(candidate_k)s
+        )
         SELECT
           gc.chunk_id::text,
           gc.guideline_id::text,
@@ -107,33 +286,58 @@ class Repository:
           gc.section_heading,
           gc.chunk_text,
           gc.source_url,
-          coalesce(1 - (gc.embedding <=> %(embedding)s::vector), 0) AS vector_score,
-          ts_rank_cd(gc.tsv, plainto_tsquery('english', %(query)s)) AS text_score,
+          coalesce(1 - (gc.embedding <=> %(embedding)b::vector), 0) AS vector_score,
+          ts_rank_cd(gc.tsv, q.tsq) AS text_score,
           (
-            coalesce(1 - (gc.embedding <=> %(embedding)s::vector), 0) * 0.75
-            + ts_rank_cd(gc.tsv, plainto_tsquery('english', %(query)s)) * 0.25
+            coalesce(1 - (gc.embedding <=> %(embedding)b::vector), 0) * 0.75
+            + ts_rank_cd(gc.tsv, q.tsq) * 0.25
           ) AS score
-        FROM guideline_chunks gc
-        WHERE (
-          %(offence_id)s::uuid IS NULL
-          OR gc.offence_id = %(offence_id)s::uuid
-          OR gc.guideline_id IN (
-            SELECT guideline_id FROM offence_guideline_links WHERE offence_id = %(offence_id)s::uuid
-          )
+        FROM guideline_chunks gc, q
+        WHERE gc.chunk_id IN (
+          SELECT chunk_id FROM vector_candidates
+          UNION
+          SELECT chunk_id FROM text_candidates
         )
         ORDER BY score DESC
         LIMIT %(top_k)s;
         """
+        candidate_k = top_k * HYBRID_CANDIDATE_FACTOR
         params = {
-            "embedding": query_embedding,
+            # Packed float32 vector sent in pgvector's binary wire format.
+            "embedding": Vector(query_embedding),
             "query": query_text,
             "offence_id": offence_id,
             "top_k": top_k,
+            "candidate_k": candidate_k,
         }
 
         with self.connect() as conn, conn.cursor() as cur:
-            cur.execute(sql, params)
-            return [dict(row) for row in cur.fetchall()]
+            iterative = self._tune_hnsw_scan(cur, candidate_k)
+            # The offence scope filters rows after the HNSW scan; without iterative
+            # scans it could return fewer than candidate_k rows, so rank exactly.
+            params["exact_vector"] = offence_id is not None and not iterative
+            return list(cur.stream(sql, params))
+
+    def _tune_hnsw_scan(self, cur: psycopg.Cursor, candidate_k: int) -> bool:
+        """Widen the HNSW search for this transaction; True if iterative scans are on."""
+        # One round trip: hnsw.iterative_scan only exists on pgvector >= 0.8, and the
+        # CASE keeps set_config from touching it on older versions.
+        sql = """
+        SELECT
+          set_config('hnsw.ef_search', %(ef_search)s, true) AS ef_search,
+          CASE WHEN v.ok THEN set_config('hnsw.iterative_scan', 'relaxed_order', true) END,
+          v.ok AS iterative
+        FROM (
+          SELECT coalesce(bool_or(string_to_array(extversion, '.')::int[] >= ARRAY[0, 8]), false)
+            AS ok
+          FROM pg_extension
+          WHERE extname = 'vector'
+        ) v
+        """
+        ef_search = min(max(candidate_k, HNSW_EF_SEARCH_MIN), HNSW_EF_SEARCH_MAX)
+        cur.execute(sql, {"ef_search": str(ef_search)})
+        row = cur.fetchone()
+        return bool(row and row["iterative"])
 
     def _search_guideline_chunks_text_only(
         self,
@@ -168,8 +372,7 @@ class Repository:
             "top_k": top_k,
         }
         with self.connect() as conn, conn.cursor() as cur:
-            cur.execute(sql, params)
-            return [dict(row) for row in cur.fetchall()]
+            return list(cur.stream(sql, params))
 
     def store_calculation_audit(
         self,
@@ -177,18 +380,85 @@ class Repository:
         request_payload: dict[str, Any],
         result_payload: dict[str, Any],
     ) -> None:
+        """Queue an audit row; rows are written in batches by ``flush_audit``."""
+        row = (offence_id, Json(request_payload), Json(result_payload), datetime.now(UTC))
+        with self._audit_lock:
+            if not self._audit_buffer:
+                self._audit_buffer_started = time.monotonic()
+            self._audit_buffer.append(row)
+            dropped = self._trim_audit_buffer()
+            now = time.monotonic()
+            # After a failed flush, writers leave retries to the timer for one interval.
+            due = now >= self._audit_retry_at and (
+                len(self._audit_buffer) >= self.audit_batch_size
+                or now - self._audit_buffer_started >= self.audit_flush_interval_s
+            )
+        if dropped:
+            logger.error("Audit buffer full; dropped %d oldest rows", dropped)
+        if due:
+            self.flush_audit()
+
+    def flush_audit(self) -> int:
+        """Write all queued audit rows and return how many were written.
+
+        A batch that fails on its data is retried row by row and rows that still
+        fail are dropped. If the database is unreachable, the unwritten rows go
+        back to the front of the buffer for the next flush.
+        """
+        with self._audit_lock:
+            pending = list(self._audit_buffer)
+            self._audit_buffer.clear()
+        if not pending:
+            return 0
+
         sql = """
-        INSERT INTO calculation_audit (offence_id, request_payload, result_payload)
-        VALUES (%(offence_id)s::uuid, %(request_payload)s::jsonb, %(result_payload)s::jsonb)
+        INSERT INTO calculation_audit (offence_id, request_payload, result_payload, created_at)
+        VALUES (%s::uuid, %s::jsonb, %s::jsonb, %s)
         """
-        params = {
-            "offence_id": offence_id,
-            "request_payload": Json(request_payload),
-            "result_payload": Json(result_payload),
-        }
-        with self.connect() as conn, conn.cursor() as cur:
-            cur.execute(sql, params)
-            conn.commit()
+        written = 0
+        done = 0
+        try:
+            with self.connect() as conn:
+                try:
+                    with conn.cursor() as cur:
+                        cur.executemany(sql, pending)
+                    conn.commit()
+                    return len(pending)
+                except psycopg.OperationalError:
+                    raise
+                except psycopg.Error:
+                    conn.rollback()
+                    logger.warning("Audit batch of %d rows failed; retrying each row", len(pending))
+
+                # One transaction per row, so a bad row (e.g. an offence_id removed by an
+                # ETL reload) is dropped without taking the rest of the batch with it.
+                for row in pending:
+                    try:
+                        with conn.transaction():
+                            conn.execute(sql, row)
+                        written += 1
+                    except psycopg.OperationalError:
+                        raise
+                    except psycopg.Error:
+                        logger.exception("Dropping audit row for offence %s", row[0])
+                    done += 1
+        except Exception:
+            with self._audit_lock:
+                self._audit_buffer.extendleft(reversed(pending[done:]))
+                dropped = self._trim_audit_buffer()
+                self._audit_retry_at = time.monotonic() + self.audit_flush_interval_s
+            logger.exception("Failed to write %d audit rows; re-queued", len(pending) - done)
+            if dropped:
+                logger.error("Audit buffer full; dropped %d oldest rows", dropped)
+        return written
+
+    def _trim_audit_buffer(self) -> int:
+        """Drop the oldest rows beyond ``audit_buffer_max``; call with ``_audit_lock`` held."""
+        dropped = 0
+        while len(self._audit_buffer) > self.audit_buffer_max:
+            self._audit_buffer.popleft()
+            dropped += 1
+        return dropped
 
     @staticmethod
     def _to_offence_record(row: dict[str, Any]) -> OffenceRecord:
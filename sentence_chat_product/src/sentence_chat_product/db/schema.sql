@@ -149,9 +149,11 @@ create table if not exists guideline_chunks (
 create index if not exists idx_guideline_chunks_guideline on guideline_chunks(guideline_id);
 create index if not exists idx_guideline_chunks_offence on guideline_chunks(offence_id);
 create index if not exists idx_guideline_chunks_tsv on guideline_chunks using gin(tsv);
-create index if not exists idx_guideline_chunks_embedding_cos
-  on guideline_chunks using ivfflat (embedding vector_cosine_ops)
-  with (lists = 100);
+drop index if exists idx_guideline_chunks_embedding_cos;
+create index if not exists idx_guideline_chunks_embedding_hnsw
+  on guideline_chunks using hnsw (embedding vector_cosine_ops);
+create index if not exists idx_guideline_chunks_unembedded
+  on guideline_chunks(created_at, chunk_id) where embedding is null;
 
 create table if not exists calculation_audit (
   audit_id uuid primary key default gen_random_uuid(),
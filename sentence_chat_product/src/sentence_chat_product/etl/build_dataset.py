@@ -3,11 +3,20 @@
 from __future__ import annotations
 
 import argparse
+import gzip
 import json
-from collections import defaultdict
+import multiprocessing
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 try:
     from rapidfuzz import fuzz, process
 except ImportError:  # pragma: no cover - fallback for minimal environments
@@ -36,24 +45,91 @@ except ImportError:  # pragma: no cover - fallback for minimal environments
                     best_index = idx
             return best_choice, best_score, best_index
 
+        @staticmethod
+        def cdist(
+            queries: list[str],
+            choices: list[str],
+            scorer,
+            score_cutoff: float | None = None,
+            dtype: Any = None,
+            workers: int = 1,
+        ) -> list[_FallbackScoreRow]:
+            rows = []
+            for query in queries:
+                row = _FallbackScoreRow(scorer(query, choice) for choice in choices)
+                if score_cutoff is not None:
+                    row = _FallbackScoreRow(score if score >= score_cutoff else 0 for score in row)
+                rows.append(row)
+            return rows
+
+    class _FallbackScoreRow(list):
+        def argmax(self) -> int:
+            return max(range(len(self)), key=self.__getitem__)
+
     fuzz = _FallbackFuzz()
     process = _FallbackProcess()
 
+try:
+    import orjson
+
+    def _jsonl_line(row: dict[str, Any]) -> bytes:
+        return orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:  # pragma: no cover - fallback for minimal environments
+
+    def _jsonl_line(row: dict[str, Any]) -> bytes:
+        return (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
 from .utils import (
     canonicalize_url,
     chunk_text,
     estimate_tokens,
     extract_slug_from_url,
     hash_file,
+    iter_json_from_zip_or_file,
     normalize_name_for_match,
     normalize_slug,
     normalize_space,
-    read_json_from_zip_or_file,
     short_offence_name,
     stable_uuid,
+    stable_uuid_parts,
     yes_no_to_bool,
 )
 
+# Memoized variants for short, heavily repeated values (labels, factors, table
+# cells, guideline names). Long free text still goes through the uncached helpers.
+_normalize_label = lru_cache(maxsize=65536)(normalize_space)
+_normalize_name = lru_cache(maxsize=65536)(normalize_name_for_match)
+
+
+def _compact(values: Iterable[str] | None) -> list[str]:
+    return list(filter(None, map(_normalize_label, values or ())))
+
+
+# (offence_catalog column, sentenceACE key) pairs copied onto every offence row.
+_SENTENCEACE_STR_FIELDS: tuple[tuple[str, str], ...] = (
+    ("offence_category", "offencecategory"),
+    ("guideline_url", "guideline"),
+    ("legislation_url", "hyperlink"),
+    ("maximum_sentence_type", "maximumsentencetype"),
+    ("maximum_sentence_amount", "maximumsentenceamount"),
+)
+_SENTENCEACE_FLAG_FIELDS: tuple[tuple[str, str], ...] = (
+    ("specified_violent", "specifiedviolentoffence"),
+    ("specified_sexual", "specifiedsexualoffence"),
+    ("specified_terrorist", "specifiedterroristoffence"),
+    ("listed_offence", "listedoffence"),
+    ("schedule18a_offence", "schedule18Aoffence"),
+    ("schedule19za", "schedule19za"),
+    ("cta_notification", "ctanotification"),
+    ("shpo", "shpo"),
+    ("disqualification", "disqualification"),
+    ("safeguarding1", "safeguarding1"),
+    ("safeguarding2", "safeguarding2"),
+    ("safeguarding3", "safeguarding3"),
+    ("safeguarding4", "safeguarding4"),
+)
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build normalized dataset for sentence chat product")
@@ -87,6 +163,17 @@ def parse_args() -> argparse.Namespace:
         default=90,
         help="Minimum fuzzy match score for linking unmapped offences",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for the matrix/factor/chunk builders (default 1 runs them inline)",
+    )
+    parser.add_argument(
+        "--compress-large",
+        action="store_true",
+        help="Write guideline_factors and guideline_chunks as gzip-compressed .jsonl.gz",
+    )
     return parser.parse_args()
 
 
@@ -95,10 +182,20 @@ def load_json(path: Path) -> list[dict[str, Any]]:
         return json.load(handle)
 
 
-def write_jsonl(path: Path, rows: list[dict[str, Any]]) -> None:
-    with path.open("w", encoding="utf-8") as handle:
-        for row in rows:
-            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+def write_jsonl(path: Path, rows: list[dict[str, Any]], compress: bool = False) -> None:
+    gz_path = path.with_name(path.name + ".gz")
+    # Drop the other variant so the loader never picks up a stale artifact.
+    (path if compress else gz_path).unlink(missing_ok=True)
+    # Rows are encoded straight to UTF-8 bytes; the 1 MiB buffer batches the writes.
+    if compress:
+        with gzip.open(gz_path, "wb", compresslevel=1) as handle:
+            handle.writelines(map(_jsonl_line, rows))
+    else:
+        with path.open("wb", buffering=1 << 20) as handle:
+            handle.writelines(map(_jsonl_line, rows))
+
+
+_STEP1_RE = re.compile(r"step 1", re.IGNORECASE)
 
 
 def cleaned_legislation(text: str) -> str:
@@ -107,46 +204,57 @@ def cleaned_legislation(text: str) -> str:
         return ""
     if len(value) <= 800:
         return value
-    marker = value.lower().find("step 1")
-    if marker > 80:
-        value = value[:marker]
+    match = _STEP1_RE.search(value, 0, 1000)
+    if match and match.start() > 80:
+        value = value[: match.start()]
     return value[:800]
 
 
-def guideline_doc_from_offence_guideline(item: dict[str, Any]) -> dict[str, Any]:
-    url = canonicalize_url(item.get("url", ""))
-    slug = extract_slug_from_url(url) or normalize_slug(item.get("offence_name", ""))
+def guideline_identity(raw_url: str | None, name: str | None) -> tuple[str, str, str]:
+    """Canonical (url, slug, dedupe key) for a scraped guideline or page."""
+    url = canonicalize_url(raw_url)
+    slug = extract_slug_from_url(url) or normalize_slug(name or "")
+    return url, slug, url or slug or stable_uuid("guideline", "")
+
+
+def guideline_doc_from_offence_guideline(
+    item: dict[str, Any],
+    identity: tuple[str, str, str] | None = None,
+) -> dict[str, Any]:
+    url, slug, _ = identity or guideline_identity(item.get("url", ""), item.get("offence_name", ""))
     guideline_id = stable_uuid("guideline", url or slug)
     return {
         "guideline_id": guideline_id,
         "slug": slug,
         "offence_name": normalize_space(item.get("offence_name", "Unknown offence")),
         "url": url,
-        "court_type": normalize_space(item.get("court_type", "")),
-        "category": normalize_space(item.get("category", "")),
-        "source_tab": normalize_space(item.get("source_tab", "Offences")),
-        "effective_from": normalize_space(item.get("effective_from", "")),
+        "court_type": _normalize_label(item.get("court_type", "")),
+        "category": _normalize_label(item.get("category", "")),
+        "source_tab": _normalize_label(item.get("source_tab", "Offences")),
+        "effective_from": _normalize_label(item.get("effective_from", "")),
         "legislation_text": cleaned_legislation(item.get("legislation", "")),
         "page_type": "offence",
         "source_payload": item,
     }
 
 
-def guideline_doc_from_page(item: dict[str, Any]) -> dict[str, Any]:
-    url = canonicalize_url(item.get("url", ""))
-    slug = extract_slug_from_url(url) or normalize_slug(item.get("title", ""))
+def guideline_doc_from_page(
+    item: dict[str, Any],
+    identity: tuple[str, str, str] | None = None,
+) -> dict[str, Any]:
+    url, slug, _ = identity or guideline_identity(item.get("url", ""), item.get("title", ""))
     guideline_id = stable_uuid("guideline", url or slug)
     return {
         "guideline_id": guideline_id,
         "slug": slug,
         "offence_name": normalize_space(item.get("title", "Untitled page")),
         "url": url,
-        "court_type": normalize_space(item.get("court_type", "")),
-        "category": normalize_space(item.get("category", "")),
-        "source_tab": normalize_space(item.get("source_tab", "")),
+        "court_type": _normalize_label(item.get("court_type", "")),
+        "category": _normalize_label(item.get("category", "")),
+        "source_tab": _normalize_label(item.get("source_tab", "")),
         "effective_from": "",
         "legislation_text": "",
-        "page_type": normalize_space(item.get("page_type", "page")) or "page",
+        "page_type": _normalize_label(item.get("page_type", "page")) or "page",
         "source_payload": item,
     }
 
@@ -155,23 +263,27 @@ def load_guideline_documents(
     scraped_guidelines: list[dict[str, Any]],
     pages: list[dict[str, Any]] | None,
 ) -> list[dict[str, Any]]:
-    docs_by_key: dict[str, dict[str, Any]] = {}
-
+    # Dedupe on the cheap identity first so duplicate rows never build a doc.
+    # A later scraped guideline replaces an earlier one but keeps its position.
+    latest_by_key: dict[str, tuple[tuple[str, str, str], dict[str, Any]]] = {}
     for row in scraped_guidelines:
-        doc = guideline_doc_from_offence_guideline(row)
-        key = doc["url"] or doc["slug"] or doc["guideline_id"]
-        docs_by_key[key] = doc
+        identity = guideline_identity(row.get("url", ""), row.get("offence_name", ""))
+        latest_by_key[identity[2]] = (identity, row)
+
+    docs_by_key: dict[str, dict[str, Any]] = {
+        key: guideline_doc_from_offence_guideline(row, identity)
+        for key, (identity, row) in latest_by_key.items()
+    }
 
     if pages:
         for page in pages:
-            page_type = normalize_space(page.get("page_type", ""))
+            page_type = _normalize_label(page.get("page_type", ""))
             if page_type == "offence":
                 continue
-            doc = guideline_doc_from_page(page)
-            key = doc["url"] or doc["slug"] or doc["guideline_id"]
-            if key in docs_by_key:
+            identity = guideline_identity(page.get("url", ""), page.get("title", ""))
+            if identity[2] in docs_by_key:
                 continue
-            docs_by_key[key] = doc
+            docs_by_key[identity[2]] = guideline_doc_from_page(page, identity)
 
     return list(docs_by_key.values())
 
@@ -179,18 +291,22 @@ def load_guideline_documents(
 def select_guideline_candidate(
     offence_name: str,
     candidates: list[dict[str, Any]],
+    query: str | None = None,
 ) -> tuple[dict[str, Any], float]:
     if len(candidates) == 1:
         return candidates[0], 0.99
 
-    query = normalize_name_for_match(short_offence_name(offence_name))
-    scored: list[tuple[float, dict[str, Any]]] = []
-    for item in candidates:
-        candidate_name = normalize_name_for_match(item["offence_name"])
-        score = fuzz.token_set_ratio(query, candidate_name) / 100.0
-        scored.append((score, item))
-    scored.sort(key=lambda pair: pair[0], reverse=True)
-    return scored[0][1], scored[0][0]
+    if query is None:
+        query = _normalize_name(short_offence_name(offence_name))
+    # max() keeps the first of equal scores, as the stable descending sort did.
+    score, best = max(
+        (
+            (fuzz.token_set_ratio(query, _normalize_name(item["offence_name"])) / 100.0, item)
+            for item in candidates
+        ),
+        key=itemgetter(0),
+    )
+    return best, score
 
 
 def slug_variants(slug: str) -> list[str]:
@@ -216,8 +332,45 @@ def slug_variants(slug: str) -> list[str]:
     return ordered
 
 
+def token_set_key(text: str) -> str:
+    return " ".join(sorted(set(text.split())))
+
+
+def best_fuzzy_matches(
+    queries: list[str],
+    choices: list[str],
+    threshold: float,
+) -> list[tuple[int, float] | None]:
+    """Best (choice index, score) for every query, or None when below threshold.
+
+    Scores the whole query x choice matrix in one ``cdist`` call so choices are
+    processed once and the work is spread across threads.
+    """
+    if not queries or not choices:
+        return [None] * len(queries)
+
+    # token_set_ratio only looks at each side's set of tokens, so handing it
+    # pre-deduplicated, pre-sorted token strings gives identical scores while
+    # saving the per-pair split/dedupe/sort work.
+    scores = process.cdist(
+        [token_set_key(query) for query in queries],
+        [token_set_key(choice) for choice in choices],
+        scorer=fuzz.token_set_ratio,
+        score_cutoff=threshold,
+        # cdist defaults to float32; keep scores comparable with the float threshold.
+        dtype=np.float64,
+        workers=-1,
+    )
+    matches: list[tuple[int, float] | None] = []
+    for row in scores:
+        best = int(row.argmax())
+        score = float(row[best])
+        matches.append((best, score) if score >= threshold else None)
+    return matches
+
+
 def build_offence_catalog_and_links(
-    sentenceace_rows: list[dict[str, Any]],
+    sentenceace_rows: Iterable[dict[str, Any]],
     guideline_docs: list[dict[str, Any]],
     fuzzy_threshold: int,
 ) -> tuple[
@@ -226,56 +379,59 @@ def build_offence_catalog_and_links(
     dict[str, str],
     list[dict[str, Any]],
 ]:
-    docs_by_slug: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    docs_by_norm_name: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    docs_by_slug: dict[str, list[dict[str, Any]]] = {}
+    # Fuzzy matches only ever take the first document carrying a name.
+    first_doc_by_norm_name: dict[str, dict[str, Any]] = {}
 
     for doc in guideline_docs:
         slug = doc["slug"]
         if slug:
-            docs_by_slug[slug].append(doc)
-        norm_name = normalize_name_for_match(doc["offence_name"])
+            docs_by_slug.setdefault(slug, []).append(doc)
+        norm_name = _normalize_name(doc["offence_name"])
         if norm_name:
-            docs_by_norm_name[norm_name].append(doc)
+            first_doc_by_norm_name.setdefault(norm_name, doc)
+
+    fuzzy_choices = list(first_doc_by_norm_name)
 
-    fuzzy_choices = list(docs_by_norm_name.keys())
+    # Many offences share a guideline URL, so resolve each distinct query slug's
+    # variants against the index only once.
+    candidates_by_slug: dict[str, list[dict[str, Any]]] = {}
+
+    def slug_candidates(slug: str) -> list[dict[str, Any]]:
+        found = candidates_by_slug.get(slug)
+        if found is None:
+            found = [
+                doc for variant in slug_variants(slug) for doc in docs_by_slug.get(variant, ())
+            ]
+            candidates_by_slug[slug] = found
+        return found
 
     offence_rows: list[dict[str, Any]] = []
     link_rows: list[dict[str, Any]] = []
     primary_offence_by_guideline: dict[str, tuple[str, float]] = {}
     mapping_issues: list[dict[str, Any]] = []
+    # (offence_id, canonical_name, guideline_url, matched_doc, match_method, match_confidence)
+    resolved: list[tuple[str, str, str, dict[str, Any] | None, str, float]] = []
+    fuzzy_pending: list[tuple[int, str]] = []
 
     for raw in sentenceace_rows:
         full_name = normalize_space(raw.get("offencename", "Unknown offence"))
         provision = normalize_space(raw.get("provision", ""))
         offence_key = f"{provision}|{full_name}"
         offence_id = stable_uuid("offence", offence_key)
+        short_name = short_offence_name(full_name)
+        norm_query = normalize_name_for_match(short_name)
 
-        row = {
+        row: dict[str, Any] = {
             "offence_id": offence_id,
             "canonical_name": full_name,
-            "short_name": short_offence_name(full_name),
-            "offence_category": normalize_space(raw.get("offencecategory", "")),
+            "short_name": short_name,
             "provision": provision,
-            "guideline_url": normalize_space(raw.get("guideline", "")),
-            "legislation_url": normalize_space(raw.get("hyperlink", "")),
-            "maximum_sentence_type": normalize_space(raw.get("maximumsentencetype", "")),
-            "maximum_sentence_amount": normalize_space(raw.get("maximumsentenceamount", "")),
-            "minimum_sentence_code": normalize_space(raw.get("minimumsentence", "")),
-            "specified_violent": yes_no_to_bool(raw.get("specifiedviolentoffence")),
-            "specified_sexual": yes_no_to_bool(raw.get("specifiedsexualoffence")),
-            "specified_terrorist": yes_no_to_bool(raw.get("specifiedterroristoffence")),
-            "listed_offence": yes_no_to_bool(raw.get("listedoffence")),
-            "schedule18a_offence": yes_no_to_bool(raw.get("schedule18Aoffence")),
-            "schedule19za": yes_no_to_bool(raw.get("schedule19za")),
-            "cta_notification": yes_no_to_bool(raw.get("ctanotification")),
-            "shpo": yes_no_to_bool(raw.get("shpo")),
-            "disqualification": yes_no_to_bool(raw.get("disqualification")),
-            "safeguarding1": yes_no_to_bool(raw.get("safeguarding1")),
-            "safeguarding2": yes_no_to_bool(raw.get("safeguarding2")),
-            "safeguarding3": yes_no_to_bool(raw.get("safeguarding3")),
-            "safeguarding4": yes_no_to_bool(raw.get("safeguarding4")),
-            "source_payload": raw,
         }
+        row.update({dst: normalize_space(raw.get(src, "")) for dst, src in _SENTENCEACE_STR_FIELDS})
+        row["minimum_sentence_code"] = normalize_space(raw.get("minimumsentence", "")).upper()
+        row.update({dst: yes_no_to_bool(raw.get(src)) for dst, src in _SENTENCEACE_FLAG_FIELDS})
+        row["source_payload"] = raw
         offence_rows.append(row)
 
         matched_doc: dict[str, Any] | None = None
@@ -283,39 +439,71 @@ def build_offence_catalog_and_links(
         match_confidence = 0.0
 
         guideline_slug = extract_slug_from_url(row["guideline_url"])
-        guideline_candidates: list[dict[str, Any]] = []
-        if guideline_slug:
-            for variant in slug_variants(guideline_slug):
-                guideline_candidates.extend(docs_by_slug.get(variant, []))
+        guideline_candidates = slug_candidates(guideline_slug)
         if guideline_candidates:
-            matched_doc, match_confidence = select_guideline_candidate(full_name, guideline_candidates)
+            matched_doc, match_confidence = select_guideline_candidate(
+                full_name,
+                guideline_candidates,
+                norm_query,
+            )
             match_method = "guideline_slug"
         else:
-            generated_slug = normalize_slug(short_offence_name(full_name))
-            generated_candidates: list[dict[str, Any]] = []
-            for variant in slug_variants(generated_slug):
-                generated_candidates.extend(docs_by_slug.get(variant, []))
+            generated_slug = normalize_slug(short_name)
+            generated_candidates = slug_candidates(generated_slug)
             if generated_candidates:
                 matched_doc, match_confidence = select_guideline_candidate(
                     full_name,
                     generated_candidates,
+                    norm_query,
                 )
                 match_method = "name_slug"
-            else:
-                query = normalize_name_for_match(short_offence_name(full_name))
-                if query and fuzzy_choices:
-                    fuzzy_match = process.extractOne(query, fuzzy_choices, scorer=fuzz.token_set_ratio)
-                    if fuzzy_match and fuzzy_match[1] >= fuzzy_threshold:
-                        matched_doc = docs_by_norm_name[fuzzy_match[0]][0]
-                        match_confidence = fuzzy_match[1] / 100.0
-                        match_method = "fuzzy_name"
+            elif norm_query:
+                fuzzy_pending.append((len(resolved), norm_query))
+
+        resolved.append(
+            (
+                offence_id,
+                full_name,
+                row["guideline_url"],
+                matched_doc,
+                match_method,
+                match_confidence,
+            )
+        )
 
+    # Fuzzy fallback for everything the slug lookups missed, scored in one batch.
+    fuzzy_matches = best_fuzzy_matches(
+        [query for _, query in fuzzy_pending], fuzzy_choices, fuzzy_threshold
+    )
+    for (position, _), fuzzy_match in zip(fuzzy_pending, fuzzy_matches, strict=True):
+        if fuzzy_match is None:
+            continue
+        choice_index, score = fuzzy_match
+        offence_id, full_name, guideline_url, _, _, _ = resolved[position]
+        matched_doc = first_doc_by_norm_name[fuzzy_choices[choice_index]]
+        resolved[position] = (
+            offence_id,
+            full_name,
+            guideline_url,
+            matched_doc,
+            "fuzzy_name",
+            score / 100.0,
+        )
+
+    for (
+        offence_id,
+        full_name,
+        guideline_url,
+        matched_doc,
+        match_method,
+        match_confidence,
+    ) in resolved:
         if not matched_doc:
             mapping_issues.append(
                 {
                     "offence_id": offence_id,
                     "canonical_name": full_name,
-                    "guideline_url": row["guideline_url"],
+                    "guideline_url": guideline_url,
                     "issue": "No guideline match",
                 }
             )
@@ -323,7 +511,7 @@ def build_offence_catalog_and_links(
 
         guideline_id = matched_doc["guideline_id"]
         link_row = {
-            "link_id": stable_uuid("offence_guideline_link", f"{offence_id}|{guideline_id}"),
+            "link_id": stable_uuid_parts("offence_guideline_link", offence_id, guideline_id),
             "offence_id": offence_id,
             "guideline_id": guideline_id,
             "match_method": match_method,
@@ -340,18 +528,16 @@ def build_offence_catalog_and_links(
     return offence_rows, link_rows, primary_map, mapping_issues
 
 
-def guideline_sections(doc: dict[str, Any]) -> list[dict[str, str]]:
+def iter_guideline_sections(doc: dict[str, Any]) -> Iterator[dict[str, str]]:
     payload = doc["source_payload"]
     page_type = doc["page_type"]
 
-    sections: list[dict[str, str]] = []
-
     if page_type != "offence":
         top_sections = payload.get("sections", [])
         for section in top_sections:
-            heading = normalize_space(section.get("heading", "Section"))
+            heading = _normalize_label(section.get("heading", "Section"))
             body_parts = [normalize_space(section.get("text", ""))]
-            bullets = [normalize_space(b) for b in section.get("bullets", []) if normalize_space(b)]
+            bullets = _compact(section.get("bullets"))
             if bullets:
                 body_parts.append("Bullets: " + " | ".join(bullets))
             tables = section.get("tables", [])
@@ -359,76 +545,68 @@ def guideline_sections(doc: dict[str, Any]) -> list[dict[str, str]]:
                 table_rows = []
                 for table in tables[:2]:
                     for row in table[:20]:
-                        table_rows.append(" | ".join(normalize_space(cell) for cell in row if normalize_space(cell)))
+                        table_rows.append(" | ".join(_compact(row)))
                 if table_rows:
                     body_parts.append("Tables: " + " || ".join(table_rows))
             text = normalize_space(" ".join(body_parts))
             if text:
-                sections.append({"section_type": "supplementary_section", "heading": heading, "text": text})
-        return sections
-
-    sections.append(
-        {
-            "section_type": "overview",
-            "heading": "Offence overview",
-            "text": normalize_space(
-                " ".join(
-                    [
-                        f"Offence: {doc['offence_name']}",
-                        f"Court: {doc.get('court_type', '')}",
-                        f"Category: {doc.get('category', '')}",
-                        f"Effective from: {doc.get('effective_from', '')}",
-                    ]
-                )
-            ),
-        }
-    )
+                yield {"section_type": "supplementary_section", "heading": heading, "text": text}
+        return
+
+    yield {
+        "section_type": "overview",
+        "heading": "Offence overview",
+        "text": normalize_space(
+            " ".join(
+                [
+                    f"Offence: {doc['offence_name']}",
+                    f"Court: {doc.get('court_type', '')}",
+                    f"Category: {doc.get('category', '')}",
+                    f"Effective from: {doc.get('effective_from', '')}",
+                ]
+            )
+        ),
+    }
 
     legislation = cleaned_legislation(payload.get("legislation", ""))
     if legislation:
-        sections.append(
-            {
-                "section_type": "legislation",
-                "heading": "Legislation",
-                "text": legislation,
-            }
-        )
+        yield {
+            "section_type": "legislation",
+            "heading": "Legislation",
+            "text": legislation,
+        }
 
     culpability_rows = []
     for row in payload.get("culpability_levels", []):
-        level = normalize_space(row.get("level", ""))
+        level = _normalize_label(row.get("level", ""))
         description = normalize_space(row.get("description", ""))
-        factors = [normalize_space(item) for item in row.get("factors", []) if normalize_space(item)]
+        factors = _compact(row.get("factors"))
         row_text = f"{level}: {description}"
         if factors:
             row_text += " Factors: " + " | ".join(factors)
         culpability_rows.append(normalize_space(row_text))
     if culpability_rows:
-        sections.append(
-            {
-                "section_type": "culpability",
-                "heading": "Culpability levels",
-                "text": " || ".join(culpability_rows),
-            }
-        )
+        yield {
+            "section_type": "culpability",
+            "heading": "Culpability levels",
+            "text": " || ".join(culpability_rows),
+        }
 
     harm_rows = []
     for row in payload.get("harm_levels", []):
-        category = normalize_space(row.get("category", ""))
+        category = _normalize_label(row.get("category", ""))
         description = normalize_space(row.get("description", ""))
-        factors = [normalize_space(item) for item in row.get("factors", []) if normalize_space(item)]
+        factors = _compact(row.get("factors"))
         row_text = f"{category}: {description}"
         if factors:
             row_text += " Factors: " + " | ".join(factors)
         harm_rows.append(normalize_space(row_text))
     if harm_rows:
-        sections.append(
-            {
-                "section_type": "harm",
-                "heading": "Harm categories",
-                "text": " || ".join(harm_rows),
-            }
-        )
+        yield {
+            "section_type": "harm",
+            "heading": "Harm categories",
+            "text": " || ".join(harm_rows),
+        }
 
     ranges = payload.get("sentencing_ranges", [])
     range_rows = []
@@ -446,33 +624,27 @@ def guideline_sections(doc: dict[str, Any]) -> list[dict[str, str]]:
             )
         )
     if range_rows:
-        sections.append(
-            {
-                "section_type": "sentencing_ranges",
-                "heading": "Starting points and ranges",
-                "text": " || ".join(row for row in range_rows if row),
-            }
-        )
+        yield {
+            "section_type": "sentencing_ranges",
+            "heading": "Starting points and ranges",
+            "text": " || ".join(row for row in range_rows if row),
+        }
 
-    aggravating = [normalize_space(item) for item in payload.get("aggravating_factors", []) if normalize_space(item)]
+    aggravating = _compact(payload.get("aggravating_factors"))
     if aggravating:
-        sections.append(
-            {
-                "section_type": "aggravating",
-                "heading": "Aggravating factors",
-                "text": " | ".join(aggravating),
-            }
-        )
+        yield {
+            "section_type": "aggravating",
+            "heading": "Aggravating factors",
+            "text": " | ".join(aggravating),
+        }
 
-    mitigating = [normalize_space(item) for item in payload.get("mitigating_factors", []) if normalize_space(item)]
+    mitigating = _compact(payload.get("mitigating_factors"))
     if mitigating:
-        sections.append(
-            {
-                "section_type": "mitigating",
-                "heading": "Mitigating factors",
-                "text": " | ".join(mitigating),
-            }
-        )
+        yield {
+            "section_type": "mitigating",
+            "heading": "Mitigating factors",
+            "text": " | ".join(mitigating),
+        }
 
     steps = payload.get("additional_steps", [])
     if steps:
@@ -483,8 +655,8 @@ def guideline_sections(doc: dict[str, Any]) -> list[dict[str, str]]:
                 continue
             if isinstance(entry, dict):
                 pieces = [
-                    normalize_space(str(entry.get("step", ""))),
-                    normalize_space(str(entry.get("title", ""))),
+                    _normalize_label(str(entry.get("step", ""))),
+                    _normalize_label(str(entry.get("title", ""))),
                     normalize_space(str(entry.get("content", ""))),
                     normalize_space(str(entry.get("text", ""))),
                 ]
@@ -492,15 +664,11 @@ def guideline_sections(doc: dict[str, Any]) -> list[dict[str, str]]:
                 if packed:
                     step_rows.append(packed)
         if step_rows:
-            sections.append(
-                {
-                    "section_type": "additional_steps",
-                    "heading": "Additional steps",
-                    "text": " || ".join(step_rows),
-                }
-            )
-
-    return [section for section in sections if section.get("text")]
+            yield {
+                "section_type": "additional_steps",
+                "heading": "Additional steps",
+                "text": " || ".join(step_rows),
+            }
 
 
 def build_sentencing_rows(
@@ -512,22 +680,26 @@ def build_sentencing_rows(
         payload = doc["source_payload"]
         ranges = payload.get("sentencing_ranges", [])
         for idx, entry in enumerate(ranges):
-            matrix_id = stable_uuid("sentencing_matrix", f"{doc['guideline_id']}|{idx}")
+            matrix_id = stable_uuid_parts("sentencing_matrix", doc["guideline_id"], str(idx))
             rows.append(
                 {
                     "matrix_id": matrix_id,
                     "guideline_id": doc["guideline_id"],
                     "offence_id": primary_map.get(doc["guideline_id"]),
-                    "culpability": normalize_space(entry.get("culpability", "")),
-                    "harm": normalize_space(entry.get("harm", "")),
-                    "starting_point_text": normalize_space(entry.get("starting_point", "")),
-                    "category_range_text": normalize_space(entry.get("category_range", "")),
+                    "culpability": _normalize_label(entry.get("culpability", "")),
+                    "harm": _normalize_label(entry.get("harm", "")),
+                    "starting_point_text": _normalize_label(entry.get("starting_point", "")),
+                    "category_range_text": _normalize_label(entry.get("category_range", "")),
                     "source_payload": entry,
                 }
             )
     return rows
 
 
+# json.dumps builds a fresh encoder whenever a keyword differs from the defaults.
+_STEP_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
 def build_factor_rows(
     guideline_docs: list[dict[str, Any]],
     primary_map: dict[str, str],
@@ -538,14 +710,13 @@ def build_factor_rows(
         offence_id = primary_map.get(doc["guideline_id"])
 
         for factor in payload.get("aggravating_factors", []):
-            text = normalize_space(factor)
+            text = _normalize_label(factor)
             if not text:
                 continue
             rows.append(
                 {
-                    "factor_id": stable_uuid(
-                        "guideline_factor",
-                        f"{doc['guideline_id']}|aggravating|{text}",
+                    "factor_id": stable_uuid_parts(
+                        "guideline_factor", doc["guideline_id"], "aggravating", text
                     ),
                     "guideline_id": doc["guideline_id"],
                     "offence_id": offence_id,
@@ -556,14 +727,13 @@ def build_factor_rows(
             )
 
         for factor in payload.get("mitigating_factors", []):
-            text = normalize_space(factor)
+            text = _normalize_label(factor)
             if not text:
                 continue
             rows.append(
                 {
-                    "factor_id": stable_uuid(
-                        "guideline_factor",
-                        f"{doc['guideline_id']}|mitigating|{text}",
+                    "factor_id": stable_uuid_parts(
+                        "guideline_factor", doc["guideline_id"], "mitigating", text
                     ),
                     "guideline_id": doc["guideline_id"],
                     "offence_id": offence_id,
@@ -574,14 +744,15 @@ def build_factor_rows(
             )
 
         for step in payload.get("additional_steps", []):
-            text = normalize_space(json.dumps(step, ensure_ascii=False) if isinstance(step, dict) else str(step))
+            text = normalize_space(
+                _STEP_ENCODER.encode(step) if isinstance(step, dict) else str(step)
+            )
             if not text:
                 continue
             rows.append(
                 {
-                    "factor_id": stable_uuid(
-                        "guideline_factor",
-                        f"{doc['guideline_id']}|additional_step|{text}",
+                    "factor_id": stable_uuid_parts(
+                        "guideline_factor", doc["guideline_id"], "additional_step", text
                     ),
                     "guideline_id": doc["guideline_id"],
                     "offence_id": offence_id,
@@ -601,18 +772,20 @@ def build_chunk_rows(
     rows: list[dict[str, Any]] = []
 
     for doc in guideline_docs:
-        sections = guideline_sections(doc)
         offence_id = primary_map.get(doc["guideline_id"])
 
         chunk_index = 0
-        for section in sections:
+        for section in iter_guideline_sections(doc):
             chunks = chunk_text(section["text"], max_chars=1200, overlap_chars=180)
             for chunk in chunks:
                 rows.append(
                     {
-                        "chunk_id": stable_uuid(
+                        "chunk_id": stable_uuid_parts(
                             "guideline_chunk",
-                            f"{doc['guideline_id']}|{section['section_type']}|{chunk_index}|{chunk}",
+                            doc["guideline_id"],
+                            section["section_type"],
+                            str(chunk_index),
+                            chunk,
                         ),
                         "guideline_id": doc["guideline_id"],
                         "offence_id": offence_id,
@@ -635,40 +808,80 @@ def build_chunk_rows(
     return rows
 
 
+_GUIDELINE_BUILDERS = (build_sentencing_rows, build_factor_rows, build_chunk_rows)
+_worker_docs: list[dict[str, Any]] = []
+_worker_primary_map: dict[str, str] = {}
+
+
+def _init_builder_worker(guideline_docs: list[dict[str, Any]], primary_map: dict[str, str]) -> None:
+    global _worker_docs, _worker_primary_map
+    _worker_docs = guideline_docs
+    _worker_primary_map = primary_map
+
+
+def _build_shard(builder_idx: int, start: int, stop: int) -> list[dict[str, Any]]:
+    return _GUIDELINE_BUILDERS[builder_idx](_worker_docs[start:stop], _worker_primary_map)
+
+
+def build_guideline_rows(
+    guideline_docs: list[dict[str, Any]],
+    primary_map: dict[str, str],
+    workers: int = 1,
+) -> tuple[list[dict[str, Any]], ...]:
+    """Sentencing, factor and chunk rows.
+
+    Shards are per-document, so concatenating them matches a serial run.
+    """
+    if workers <= 1 or len(guideline_docs) < 2:
+        return tuple(builder(guideline_docs, primary_map) for builder in _GUIDELINE_BUILDERS)
+
+    step = -(-len(guideline_docs) // workers)
+    bounds = [
+        (start, min(start + step, len(guideline_docs)))
+        for start in range(0, len(guideline_docs), step)
+    ]
+    # Fork hands the parsed documents to workers without pickling them.
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork") if "fork" in methods else None
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_builder_worker,
+        initargs=(guideline_docs, primary_map),
+    ) as pool:
+        futures = [
+            [pool.submit(_build_shard, builder_idx, start, stop) for start, stop in bounds]
+            for builder_idx in range(len(_GUIDELINE_BUILDERS))
+        ]
+        return tuple(
+            list(chain.from_iterable(future.result() for future in shard)) for shard in futures
+        )
+
+
 def build_source_versions(
     scraped_guidelines_path: Path,
     scraped_pages_path: Path | None,
     sentenceace_path: Path,
 ) -> list[dict[str, Any]]:
-    rows = [
-        {
-            "source_version_id": stable_uuid("source_version", f"scraped_guidelines|{scraped_guidelines_path}"),
-            "source_name": "scraped_guidelines",
-            "source_path": str(scraped_guidelines_path),
-            "source_hash": hash_file(scraped_guidelines_path),
-            "metadata": {},
-        },
+    sources = [("scraped_guidelines", scraped_guidelines_path), ("sentenceace", sentenceace_path)]
+    if scraped_pages_path and scraped_pages_path.exists():
+        sources.append(("scraped_pages", scraped_pages_path))
+
+    # hashlib drops the GIL while digesting, so the file reads and hashes overlap.
+    with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+        hashes = list(pool.map(hash_file, [path for _, path in sources]))
+
+    return [
         {
-            "source_version_id": stable_uuid("source_version", f"sentenceace|{sentenceace_path}"),
-            "source_name": "sentenceace",
-            "source_path": str(sentenceace_path),
-            "source_hash": hash_file(sentenceace_path),
+            "source_version_id": stable_uuid_parts("source_version", name, str(path)),
+            "source_name": name,
+            "source_path": str(path),
+            "source_hash": source_hash,
             "metadata": {},
-        },
+        }
+        for (name, path), source_hash in zip(sources, hashes, strict=True)
     ]
 
-    if scraped_pages_path and scraped_pages_path.exists():
-        rows.append(
-            {
-                "source_version_id": stable_uuid("source_version", f"scraped_pages|{scraped_pages_path}"),
-                "source_name": "scraped_pages",
-                "source_path": str(scraped_pages_path),
-                "source_hash": hash_file(scraped_pages_path),
-                "metadata": {},
-            }
-        )
-    return rows
-
 
 def main() -> None:
     args = parse_args()
@@ -676,7 +889,8 @@ def main() -> None:
 
     scraped_guidelines = load_json(args.scraped_guidelines)
     pages = load_json(args.scraped_pages) if args.scraped_pages and args.scraped_pages.exists() else None
-    sentenceace_rows = read_json_from_zip_or_file(args.sentenceace, json_name="offences.json")
+    # Parsed lazily: offence rows are built while the sentenceACE array streams in.
+    sentenceace_rows = iter_json_from_zip_or_file(args.sentenceace, json_name="offences.json")
 
     guideline_docs = load_guideline_documents(scraped_guidelines, pages)
     offence_rows, link_rows, primary_map, mapping_issues = build_offence_catalog_and_links(
@@ -685,9 +899,9 @@ def main() -> None:
         args.fuzzy_threshold,
     )
 
-    sentencing_rows = build_sentencing_rows(guideline_docs, primary_map)
-    factor_rows = build_factor_rows(guideline_docs, primary_map)
-    chunk_rows = build_chunk_rows(guideline_docs, primary_map)
+    sentencing_rows, factor_rows, chunk_rows = build_guideline_rows(
+        guideline_docs, primary_map, args.workers
+    )
     source_versions = build_source_versions(args.scraped_guidelines, args.scraped_pages, args.sentenceace)
 
     guideline_rows = []
@@ -712,13 +926,17 @@ def main() -> None:
     write_jsonl(args.output_dir / "guidelines.jsonl", guideline_rows)
     write_jsonl(args.output_dir / "offence_guideline_links.jsonl", link_rows)
     write_jsonl(args.output_dir / "sentencing_matrix.jsonl", sentencing_rows)
-    write_jsonl(args.output_dir / "guideline_factors.jsonl", factor_rows)
-    write_jsonl(args.output_dir / "guideline_chunks.jsonl", chunk_rows)
+    write_jsonl(
+        args.output_dir / "guideline_factors.jsonl", factor_rows, compress=args.compress_large
+    )
+    write_jsonl(
+        args.output_dir / "guideline_chunks.jsonl", chunk_rows, compress=args.compress_large
+    )
     write_jsonl(args.output_dir / "mapping_issues.jsonl", mapping_issues)
 
     report = {
         "counts": {
-            "sentenceace_offences": len(sentenceace_rows),
+            "sentenceace_offences": len(offence_rows),
             "guidelines": len(guideline_rows),
             "offence_catalog": len(offence_rows),
             "offence_guideline_links": len(link_rows),
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
+from datetime import datetime
 
 import psycopg
-from openai import OpenAI
+from openai import AsyncOpenAI
+from pgvector import Vector
 from pgvector.psycopg import register_vector
 
 from sentence_chat_product.config import get_settings
@@ -18,37 +21,72 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--model", type=str, default=None)
     parser.add_argument("--batch-size", type=int, default=64)
     parser.add_argument("--limit", type=int, default=2000)
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=8,
+        help="Embedding requests in flight at once; lower it for low-RPM API tiers",
+    )
     return parser.parse_args()
 
 
 def fetch_rows(
     conn: psycopg.Connection,
     batch_size: int,
-) -> list[tuple[str, str]]:
-    sql = """
-    SELECT chunk_id::text, chunk_text
+    after: tuple[datetime, str] | None = None,
+) -> list[tuple[str, str, datetime]]:
+    # Keyset on (created_at, chunk_id): one load stamps every chunk with the same
+    # created_at, so the id breaks ties. Served by idx_guideline_chunks_unembedded.
+    keyset = "AND (created_at, chunk_id) > (%s, %s::uuid)" if after else ""
+    sql = f"""
+    SELECT chunk_id::text, chunk_text, created_at
     FROM guideline_chunks
-    WHERE embedding IS NULL
-    ORDER BY created_at ASC
+    WHERE embedding IS NULL {keyset}
+    ORDER BY created_at ASC, chunk_id ASC
     LIMIT %s;
     """
     with conn.cursor() as cur:
-        cur.execute(sql, (batch_size,))
-        return [(row[0], row[1]) for row in cur.fetchall()]
+        cur.execute(sql, (*(after or ()), batch_size))
+        return [(row[0], row[1], row[2]) for row in cur.fetchall()]
 
 
 def update_rows(
     conn: psycopg.Connection,
     rows: list[tuple[list[float], str]],
-) -> None:
-    sql = "UPDATE guideline_chunks SET embedding = %s WHERE chunk_id = %s::uuid"
+) -> int:
+    if not rows:
+        return 0
+    # One statement for the whole batch: the vector array goes over in pgvector's
+    # binary format and the server plans the update once.
+    sql = """
+    UPDATE guideline_chunks AS g
+    SET embedding = s.embedding
+    FROM unnest(%b::vector[], %s::uuid[]) AS s(embedding, chunk_id)
+    WHERE g.chunk_id = s.chunk_id
+    """
+    embeddings = [Vector(vector) for vector, _ in rows]
+    chunk_ids = [chunk_id for _, chunk_id in rows]
     with conn.cursor() as cur:
-        cur.executemany(sql, rows)
+        cur.execute(sql, (embeddings, chunk_ids))
+        updated = cur.rowcount
     conn.commit()
+    return updated
 
 
-def main() -> None:
-    args = parse_args()
+async def embed_batch(
+    client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    model: str,
+    texts: list[str],
+) -> list[list[float]]:
+    async with semaphore:
+        response = await client.embeddings.create(model=model, input=texts)
+    if len(response.data) != len(texts):
+        raise ValueError(f"Expected {len(texts)} embeddings, got {len(response.data)}")
+    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+async def run(args: argparse.Namespace) -> None:
     settings = get_settings()
 
     if not settings.openai_api_key:
@@ -56,28 +94,54 @@ def main() -> None:
 
     database_url = args.database_url or settings.database_url
     model = args.model or settings.openai_embedding_model
+    max_concurrency = max(1, args.max_concurrency)
 
-    client = OpenAI(api_key=settings.openai_api_key)
+    semaphore = asyncio.Semaphore(max_concurrency)
     processed = 0
 
-    with psycopg.connect(database_url) as conn:
-        register_vector(conn)
-
-        while processed < args.limit:
-            remaining = args.limit - processed
-            rows = fetch_rows(conn, min(args.batch_size, remaining))
-            if not rows:
-                break
+    async with AsyncOpenAI(api_key=settings.openai_api_key) as client:
+        with psycopg.connect(database_url) as conn:
+            register_vector(conn)
+
+            after: tuple[datetime, str] | None = None
+            while processed < args.limit:
+                # One window keeps every concurrent request busy with a full batch.
+                window = min(args.batch_size * max_concurrency, args.limit - processed)
+                rows = fetch_rows(conn, window, after)
+                if not rows:
+                    break
+                last_key = (rows[-1][2], rows[-1][0])
+
+                # Similar-length texts share a batch, so no request waits on one long outlier.
+                rows.sort(key=lambda row: len(row[1]), reverse=True)
+                batches = [
+                    rows[i : i + args.batch_size] for i in range(0, len(rows), args.batch_size)
+                ]
+                results = await asyncio.gather(
+                    *(
+                        embed_batch(client, semaphore, model, [row[1] for row in batch])
+                        for batch in batches
+                    )
+                )
+
+                updates = [
+                    (vector, row[0])
+                    for batch, vectors in zip(batches, results, strict=True)
+                    for vector, row in zip(vectors, batch, strict=True)
+                ]
+                updated = update_rows(conn, updates)
+                processed += updated
+                if not updated:
+                    break
+                # Embedded rows drop out of the scan, so if any row in the window was not
+                # updated, rescan from the start instead of keying past it.
+                after = last_key if updated == len(rows) else None
 
-            texts = [row[1] for row in rows]
-            response = client.embeddings.create(model=model, input=texts)
-            vectors = [item.embedding for item in response.data]
+    print(json.dumps({"embedded_rows": processed, "model": model}, indent=2))
 
-            updates = [(vectors[i], rows[i][0]) for i in range(len(rows))]
-            update_rows(conn, updates)
-            processed += len(rows)
 
-    print(json.dumps({"embedded_rows": processed, "model": model}, indent=2))
+def main() -> None:
+    asyncio.run(run(parse_args()))
 
 
 if __name__ == "__main__":
@@ -3,12 +3,24 @@
 from __future__ import annotations
 
 import argparse
+import gzip
 import json
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
 from typing import Any
 
 import psycopg
-from psycopg.types.json import Json
+from psycopg.types.json import Json, set_json_dumps
+from psycopg_pool import ConnectionPool
+
+try:
+    from orjson import dumps as _json_dumps
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - fallback for minimal environments
+    from json import dumps as _json_dumps
+    from json import loads as _json_loads
 
 from sentence_chat_product.config import get_settings
 
@@ -123,6 +135,12 @@ TABLE_ORDER = [
     "guideline_factors",
     "guideline_chunks",
 ]
+# Artifact variants tried per table, in order of preference.
+DATASET_EXTENSIONS = (".jsonl", ".jsonl.gz", ".parquet")
+
+# Foreign-key parents load first, in order; every child table references only these.
+PARENT_TABLES = TABLE_ORDER[:3]
+CHILD_TABLES = TABLE_ORDER[3:]
 
 
 def parse_args() -> argparse.Namespace:
@@ -142,40 +160,64 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def read_jsonl(path: Path) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
+def read_jsonl(path: Path) -> Iterator[dict[str, Any]]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    # Raw bytes go straight to the decoder; no intermediate str per line.
+    with opener(path, "rb") as handle:
+        for line_no, line in enumerate(handle, start=1):
             line = line.strip()
             if not line:
                 continue
-            rows.append(json.loads(line))
-    return rows
+            try:
+                yield _json_loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path}:{line_no}: invalid JSON ({exc.msg})") from exc
+
+
+def read_parquet(path: Path, batch_size: int = 10_000) -> Iterator[dict[str, Any]]:
+    """Stream rows as dicts, one Parquet batch at a time.
+
+    Struct columns have a fixed schema, so a key absent from a row comes back as
+    ``None`` rather than missing; JSON payloads loaded this way carry those nulls.
+    """
+    import pyarrow.parquet as pq  # optional: install the "parquet" extra
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
 
 
-def adapt_row(
-    row: dict[str, Any],
+def make_row_adapter(
     columns: list[str],
     json_fields: set[str],
-) -> tuple[Any, ...]:
-    out: list[Any] = []
-    for col in columns:
-        value = row.get(col)
-        if col in json_fields:
-            out.append(Json(value if value is not None else {}))
-        else:
-            out.append(value)
-    return tuple(out)
+) -> Callable[[dict[str, Any]], tuple[Any, ...]]:
+    """Per-table row adapter with the column order and JSON positions resolved once."""
+    columns_t = tuple(columns)
+    json_positions = tuple(idx for idx, col in enumerate(columns_t) if col in json_fields)
+
+    def adapt(row: dict[str, Any]) -> tuple[Any, ...]:
+        out = list(map(row.get, columns_t))
+        for idx in json_positions:
+            value = out[idx]
+            out[idx] = Json(value if value is not None else {})
+        return tuple(out)
+
+    return adapt
+
+
+COPY_THRESHOLD = 200
 
 
 def upsert_table(
     conn: psycopg.Connection,
     table: str,
-    rows: list[dict[str, Any]],
+    rows: Iterable[dict[str, Any]],
     columns: list[str],
     json_fields: set[str],
 ) -> int:
-    if not rows:
+    rows = iter(rows)
+    head = list(islice(rows, COPY_THRESHOLD))
+    if not head:
         return 0
 
     placeholders = ", ".join(["%s"] * len(columns))
@@ -183,19 +225,35 @@ def upsert_table(
 
     update_cols = [col for col in columns if not col.endswith("_id")]
     set_clause = ", ".join([f"{col} = EXCLUDED.{col}" for col in update_cols])
-
-    sql = (
-        f"INSERT INTO {table} ({columns_sql}) VALUES ({placeholders}) "
-        f"ON CONFLICT ({columns[0]}) DO UPDATE SET {set_clause}"
-    )
-
-    values = [adapt_row(row, columns, json_fields) for row in rows]
+    conflict_sql = f"ON CONFLICT ({columns[0]}) DO UPDATE SET {set_clause}"
+    adapt = make_row_adapter(columns, json_fields)
 
     with conn.cursor() as cur:
-        cur.executemany(sql, values)
+        if len(head) < COPY_THRESHOLD:
+            sql = f"INSERT INTO {table} ({columns_sql}) VALUES ({placeholders}) {conflict_sql}"
+            cur.executemany(sql, (adapt(row) for row in head))
+            count = len(head)
+        else:
+            staging = f"stg_{table}"
+            cur.execute(
+                f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            cur.execute(f"ALTER TABLE {staging} ADD COLUMN _load_seq bigserial")
+            count = 0
+            with cur.copy(f"COPY {staging} ({columns_sql}) FROM STDIN") as copy:
+                for row in chain(head, rows):
+                    copy.write_row(adapt(row))
+                    count += 1
+            # A single INSERT .. ON CONFLICT cannot touch the same key twice, so keep
+            # only the last staged row per key, as successive executemany upserts would.
+            cur.execute(
+                f"INSERT INTO {table} ({columns_sql}) "
+                f"SELECT DISTINCT ON ({columns[0]}) {columns_sql} FROM {staging} "
+                f"ORDER BY {columns[0]}, _load_seq DESC {conflict_sql}"
+            )
 
     conn.commit()
-    return len(rows)
+    return count
 
 
 def maybe_truncate(conn: psycopg.Connection) -> None:
@@ -216,6 +274,28 @@ def maybe_truncate(conn: psycopg.Connection) -> None:
     conn.commit()
 
 
+def load_table(conn: psycopg.Connection, dataset_dir: Path, table: str) -> int:
+    candidates = [dataset_dir / f"{table}{ext}" for ext in DATASET_EXTENSIONS]
+    file_path = next((path for path in candidates if path.exists()), None)
+    if file_path is None:
+        return 0
+
+    config = TABLE_CONFIG[table]
+    rows = read_parquet(file_path) if file_path.suffix == ".parquet" else read_jsonl(file_path)
+    return upsert_table(
+        conn,
+        table,
+        rows,
+        config["columns"],
+        config["json_fields"],
+    )
+
+
+def _load_table_pooled(pool: ConnectionPool, dataset_dir: Path, table: str) -> int:
+    with pool.connection() as conn:
+        return load_table(conn, dataset_dir, table)
+
+
 def main() -> None:
     args = parse_args()
     settings = get_settings()
@@ -224,27 +304,28 @@ def main() -> None:
     if not args.dataset_dir.exists():
         raise FileNotFoundError(f"Dataset dir not found: {args.dataset_dir}")
 
-    with psycopg.connect(database_url) as conn:
-        if args.truncate:
-            maybe_truncate(conn)
+    counts: dict[str, int] = {}
+    with ConnectionPool(
+        database_url,
+        min_size=1,
+        max_size=len(CHILD_TABLES),
+        configure=lambda conn: set_json_dumps(_json_dumps, conn),
+        open=False,
+    ) as pool:
+        with pool.connection() as conn:
+            if args.truncate:
+                maybe_truncate(conn)
+            for table in PARENT_TABLES:
+                counts[table] = load_table(conn, args.dataset_dir, table)
 
-        counts: dict[str, int] = {}
-        for table in TABLE_ORDER:
-            file_path = args.dataset_dir / f"{table}.jsonl"
-            if not file_path.exists():
-                counts[table] = 0
-                continue
-
-            config = TABLE_CONFIG[table]
-            rows = read_jsonl(file_path)
-            loaded = upsert_table(
-                conn,
-                table,
-                rows,
-                config["columns"],
-                config["json_fields"],
-            )
-            counts[table] = loaded
+        # Children only reference the parents above, so they load side by side.
+        with ThreadPoolExecutor(max_workers=len(CHILD_TABLES)) as executor:
+            futures = {
+                table: executor.submit(_load_table_pooled, pool, args.dataset_dir, table)
+                for table in CHILD_TABLES
+            }
+            for table, future in futures.items():
+                counts[table] = future.result()
 
     print(json.dumps({"loaded": counts}, indent=2))
 
@@ -6,17 +6,54 @@ import hashlib
 import json
 import re
 import uuid
+from collections.abc import Iterator
+from functools import cache
 from pathlib import Path
+from typing import IO
 from urllib.parse import urlparse
 from zipfile import ZipFile
 
+try:
+    import ijson
+
+    def _iter_json_items(handle: IO[bytes]) -> Iterator[dict]:
+        return ijson.items(handle, "item", use_float=True)
+
+except ImportError:  # pragma: no cover - fallback for minimal environments
+
+    def _iter_json_items(handle: IO[bytes]) -> Iterator[dict]:
+        return iter(json.load(handle))
+
+
 WORD_RE = re.compile(r"\w+")
+SPACE_RE = re.compile(r"\s+")
+NON_SLUG_RE = re.compile(r"[^a-z0-9\-]+")
+DIGIT_DASH_RE = re.compile(r"(?<=\d)-(?=\d)")
+MULTI_DASH_RE = re.compile(r"-{2,}")
+PAREN_RE = re.compile(r"\([^)]*\)")
+NON_ALNUM_SPACE_RE = re.compile(r"[^a-z0-9 ]+")
 
 
 def normalize_space(value: str | None) -> str:
     if not value:
         return ""
-    return re.sub(r"\s+", " ", value).strip()
+    # Every whitespace character other than " " is non-printable, so already-normalized
+    # text (the common case, e.g. chunk_text on section bodies) skips the regex pass.
+    if value.isprintable() and "  " not in value:
+        return value.strip()
+    return SPACE_RE.sub(" ", value).strip()
+
+
+# Exact spellings seen in sentenceACE exports; anything else takes the slow path.
+_YES_NO: dict[str, bool] = {
+    "Yes": True,
+    "yes": True,
+    "YES": True,
+    "No": False,
+    "no": False,
+    "NO": False,
+    "": False,
+}
 
 
 def yes_no_to_bool(value: str | bool | None) -> bool:
@@ -24,7 +61,11 @@ def yes_no_to_bool(value: str | bool | None) -> bool:
         return value
     if value is None:
         return False
-    return normalize_space(str(value)).lower() == "yes"
+    text = str(value)
+    known = _YES_NO.get(text)
+    if known is not None:
+        return known
+    return text.strip().lower() == "yes"
 
 
 def short_offence_name(full_name: str) -> str:
@@ -37,33 +78,36 @@ def short_offence_name(full_name: str) -> str:
     return right.strip()
 
 
-def stable_uuid(namespace: str, value: str) -> str:
+@cache
+def _namespace_hasher(namespace: str) -> hashlib._Hash:
     ns = uuid.uuid5(uuid.NAMESPACE_URL, namespace)
-    return str(uuid.uuid5(ns, value))
+    return hashlib.sha1(ns.bytes, usedforsecurity=False)
+
+
+def stable_uuid(namespace: str, value: str) -> str:
+    # uuid5(uuid5(NAMESPACE_URL, namespace), value), with the namespace digest state reused.
+    hasher = _namespace_hasher(namespace).copy()
+    hasher.update(value.encode("utf-8"))
+    return str(uuid.UUID(bytes=hasher.digest()[:16], version=5))
+
+
+def stable_uuid_parts(namespace: str, *parts: str) -> str:
+    """Equivalent to ``stable_uuid(namespace, "|".join(parts))``, without the joined string."""
+    hasher = _namespace_hasher(namespace).copy()
+    for idx, part in enumerate(parts):
+        if idx:
+            hasher.update(b"|")
+        hasher.update(part.encode("utf-8"))
+    return str(uuid.UUID(bytes=hasher.digest()[:16], version=5))
 
 
 def hash_file(path: Path) -> str:
-    hasher = hashlib.sha256()
     with path.open("rb") as handle:
-        while True:
-            block = handle.read(1024 * 1024)
-            if not block:
-                break
-            hasher.update(block)
-    return hasher.hexdigest()
+        return hashlib.file_digest(handle, "sha256").hexdigest()
 
 
-def extract_slug_from_url(url: str | None) -> str:
-    if not url:
-        return ""
-    parsed = urlparse(url)
-    path = parsed.path.rstrip("/")
-    if not path:
-        return ""
-    parts = [p for p in path.split("/") if p]
-    if not parts:
-        return ""
-    ignored = {
+IGNORED_SLUG_PARTS = frozenset(
+    {
         "offences",
         "guidelines",
         "item",
@@ -71,9 +115,19 @@ def extract_slug_from_url(url: str | None) -> str:
         "magistrates-court",
         "both-courts",
     }
+)
+
+
+def extract_slug_from_url(url: str | None) -> str:
+    if not url:
+        return ""
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/")
+    if not path:
+        return ""
     candidate = ""
-    for part in parts[::-1]:
-        if part.lower() in ignored:
+    for part in reversed(path.split("/")):
+        if not part or part.lower() in IGNORED_SLUG_PARTS:
             continue
         candidate = part
         break
@@ -94,24 +148,26 @@ def canonicalize_url(url: str | None) -> str:
 def normalize_slug(value: str) -> str:
     text = normalize_space(value).lower()
     text = text.replace("_", "-")
-    text = re.sub(r"[^a-z0-9\-]+", "-", text)
+    text = NON_SLUG_RE.sub("-", text)
     # Normalize numeric groups like 5-000 -> 5000 for cross-source slug matching.
-    text = re.sub(r"(?<=\d)-(?=\d)", "", text)
-    text = re.sub(r"-{2,}", "-", text)
+    text = DIGIT_DASH_RE.sub("", text)
+    text = MULTI_DASH_RE.sub("-", text)
     return text.strip("-")
 
 
 def normalize_name_for_match(name: str) -> str:
     text = normalize_space(name).lower()
-    text = re.sub(r"\([^)]*\)", "", text)
-    text = re.sub(r"[^a-z0-9 ]+", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = PAREN_RE.sub("", text)
+    text = NON_ALNUM_SPACE_RE.sub(" ", text)
+    text = SPACE_RE.sub(" ", text).strip()
     return text
 
 
 def estimate_tokens(text: str) -> int:
-    # Approximation that works well enough for chunk sizing and metadata.
-    return max(1, int(len(text) / 4))
+    # Approximation that works well enough for chunk sizing and metadata. Counting
+    # UTF-8 bytes keeps non-ASCII text from being underestimated; isascii() is O(1).
+    size = len(text) if text.isascii() else len(text.encode("utf-8", "ignore"))
+    return max(1, size >> 2)
 
 
 def chunk_text(text: str, max_chars: int = 1200, overlap_chars: int = 160) -> list[str]:
@@ -141,19 +197,23 @@ def chunk_text(text: str, max_chars: int = 1200, overlap_chars: int = 160) -> li
     return chunks
 
 
-def read_json_from_zip_or_file(path: Path, json_name: str = "offences.json") -> list[dict]:
+def _zip_member(zf: ZipFile, path: Path, json_name: str) -> str:
+    for info in zf.infolist():
+        name = info.filename.strip("/")
+        if name.lower().endswith(json_name.lower()):
+            return name
+    raise FileNotFoundError(f"{json_name} not found in {path}")
+
+
+def iter_json_from_zip_or_file(path: Path, json_name: str = "offences.json") -> Iterator[dict]:
+    """Stream the items of a top-level JSON array from a file or a zip member."""
     if path.suffix.lower() == ".zip":
-        with ZipFile(path, "r") as zf:
-            target = None
-            for info in zf.infolist():
-                name = info.filename.strip("/")
-                if name.lower().endswith(json_name.lower()):
-                    target = name
-                    break
-            if not target:
-                raise FileNotFoundError(f"{json_name} not found in {path}")
-            with zf.open(target, "r") as handle:
-                return json.loads(handle.read().decode("utf-8"))
-
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+        with (
+            ZipFile(path, "r") as zf,
+            zf.open(_zip_member(zf, path, json_name), "r") as handle,
+        ):
+            yield from _iter_json_items(handle)
+        return
+
+    with path.open("rb") as handle:
+        yield from _iter_json_items(handle)
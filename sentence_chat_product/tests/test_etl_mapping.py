@@ -1,6 +1,21 @@
+import uuid
+import zipfile
+
+import pytest
+
 from sentence_chat_product.etl.build_dataset import (
+    best_fuzzy_matches,
+    build_guideline_rows,
     build_offence_catalog_and_links,
+    fuzz,
     guideline_doc_from_offence_guideline,
+    token_set_key,
+)
+from sentence_chat_product.etl.utils import (
+    iter_json_from_zip_or_file,
+    normalize_space,
+    stable_uuid,
+    stable_uuid_parts,
 )
 
 
@@ -55,3 +70,135 @@ def test_mapping_by_guideline_slug():
     assert not issues
     assert links[0]["match_method"] in {"guideline_slug", "name_slug"}
     assert links[0]["guideline_id"] in primary_map
+
+
+def _sentenceace_row(offencename, guideline=""):
+    flags = [
+        "specifiedviolentoffence",
+        "specifiedsexualoffence",
+        "specifiedterroristoffence",
+        "listedoffence",
+        "schedule18Aoffence",
+        "schedule19za",
+        "ctanotification",
+        "shpo",
+        "disqualification",
+        "safeguarding1",
+        "safeguarding2",
+        "safeguarding3",
+        "safeguarding4",
+    ]
+    row = {
+        "offencename": offencename,
+        "offencecategory": "",
+        "provision": offencename.split(":")[0],
+        "guideline": guideline,
+        "hyperlink": "",
+        "maximumsentencetype": "",
+        "maximumsentenceamount": "",
+        "minimumsentence": "",
+    }
+    row.update({flag: "No" for flag in flags})
+    return row
+
+
+def test_fuzzy_fallback_links_in_input_order():
+    guideline_docs = [
+        guideline_doc_from_offence_guideline(
+            {
+                "offence_name": "Theft from a shop or stall",
+                "url": "https://www.sentencingcouncil.org.uk/guidelines/theft-from-a-shop-or-stall/",
+                "sentencing_ranges": [],
+            }
+        )
+    ]
+    sentenceace = [
+        _sentenceace_row("Theft Act 1968 s.1: Theft from a stall or shop"),
+        _sentenceace_row("Made up Act 2000 s.1: Something unrelated"),
+        _sentenceace_row(
+            "Theft Act 1968 s.1: Theft from a shop or stall",
+            guideline="https://www.sentencingcouncil.org.uk/guidelines/theft-from-a-shop-or-stall/",
+        ),
+    ]
+
+    offences, links, _, issues = build_offence_catalog_and_links(
+        sentenceace_rows=sentenceace,
+        guideline_docs=guideline_docs,
+        fuzzy_threshold=90,
+    )
+
+    assert [link["match_method"] for link in links] == ["fuzzy_name", "guideline_slug"]
+    assert links[0]["offence_id"] == offences[0]["offence_id"]
+    assert links[0]["match_confidence"] == 1.0
+    assert [issue["offence_id"] for issue in issues] == [offences[1]["offence_id"]]
+
+
+def test_build_guideline_rows_matches_serial_run_with_workers():
+    guideline_docs = [
+        guideline_doc_from_offence_guideline(
+            {
+                "offence_name": f"Offence {idx}",
+                "url": f"https://www.sentencingcouncil.org.uk/guidelines/offence-{idx}/",
+                "legislation": f"Offence {idx} is contrary to section {idx} of the Act.",
+                "culpability_levels": [{"level": "A", "description": "High culpability"}],
+                "harm_levels": [{"level": "1", "description": "Serious harm"}],
+                "sentencing_ranges": [
+                    {
+                        "culpability": "A",
+                        "harm": "1",
+                        "starting_point": f"{idx} years custody",
+                        "category_range": f"{idx} - {idx + 2} years custody",
+                    }
+                ],
+                "aggravating_factors": ["Previous convictions", f"Factor {idx}"],
+                "mitigating_factors": ["Remorse"],
+                "additional_steps": [{"step": "Consider ancillary orders"}],
+            }
+        )
+        for idx in range(5)
+    ]
+    primary_map = {doc["guideline_id"]: f"offence-{idx}" for idx, doc in enumerate(guideline_docs)}
+
+    serial = build_guideline_rows(guideline_docs, primary_map, workers=1)
+
+    assert all(serial)
+    assert build_guideline_rows(guideline_docs, primary_map, workers=2) == serial
+
+
+def test_best_fuzzy_matches_keeps_full_precision_scores():
+    query = "theft from a shop"
+    choice = "theft from a stall"
+    expected = fuzz.token_set_ratio(token_set_key(query), token_set_key(choice))
+
+    assert best_fuzzy_matches([query], [choice], threshold=0) == [(0, expected)]
+    assert best_fuzzy_matches([query], [choice], threshold=expected + 1e-9) == [None]
+
+
+def test_stable_uuid_parts_matches_joined_value():
+    parts = ("guideline-1", "culpability", "3", "Chunk text – with unicode")
+    expected = str(uuid.uuid5(uuid.uuid5(uuid.NAMESPACE_URL, "guideline_chunk"), "|".join(parts)))
+    assert stable_uuid("guideline_chunk", "|".join(parts)) == expected
+    assert stable_uuid_parts("guideline_chunk", *parts) == expected
+
+
+def test_normalize_space_collapses_all_whitespace():
+    assert normalize_space("  Theft  act\t1968 s.1\n") == "Theft act 1968 s.1"
+    assert normalize_space(" already normalized ") == "already normalized"
+
+
+def test_iter_json_from_zip_streams_items_with_float_numbers(tmp_path):
+    pytest.importorskip("ijson")
+    path = tmp_path / "sentenceace.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(
+            "export/offences.json",
+            '[{"offencename": "Theft", "score": 1.5}, {"offencename": "Fraud", "score": 0.25}]',
+        )
+
+    items = list(iter_json_from_zip_or_file(path))
+
+    assert items == [
+        {"offencename": "Theft", "score": 1.5},
+        {"offencename": "Fraud", "score": 0.25},
+    ]
+    assert all(type(item["score"]) is float for item in items)
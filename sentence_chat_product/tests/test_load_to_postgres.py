@@ -0,0 +1,193 @@
+import gzip
+import json
+import re
+
+import pytest
+from psycopg.types.json import Json
+
+from sentence_chat_product.etl import load_to_postgres
+from sentence_chat_product.etl.build_dataset import write_jsonl
+from sentence_chat_product.etl.load_to_postgres import (
+    COPY_THRESHOLD,
+    TABLE_CONFIG,
+    load_table,
+    make_row_adapter,
+    read_jsonl,
+    read_parquet,
+    upsert_table,
+)
+
+
+class FakeCopy:
+    def __init__(self, staged):
+        self.staged = staged
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write_row(self, row):
+        self.staged.append(row)
+
+
+class FakeCursor:
+    """Records statements and replays the staged upsert's DISTINCT ON over copied rows."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.staged = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append(sql)
+        match = re.search(r"DISTINCT ON \((\w+)\).*ORDER BY \1, _load_seq DESC", sql)
+        if match:
+            # _load_seq follows COPY order, so the first row per key in descending
+            # sequence order is the last one written.
+            for row in reversed(self.staged):
+                self.conn.table.setdefault(row[0], row)
+
+    def executemany(self, sql, rows):
+        self.conn.statements.append(sql)
+        for row in rows:
+            self.conn.table[row[0]] = row
+
+    def copy(self, sql):
+        self.conn.statements.append(sql)
+        return FakeCopy(self.staged)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+        self.table = {}
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_compressed_jsonl_round_trips_and_replaces_plain_file(tmp_path):
+    rows = [{"id": "a", "text": "café"}, {"id": "b", "values": [1, 2.5, None]}]
+    path = tmp_path / "guideline_chunks.jsonl"
+    gz_path = tmp_path / "guideline_chunks.jsonl.gz"
+
+    write_jsonl(path, [{"id": "stale"}])
+    write_jsonl(path, rows, compress=True)
+
+    assert not path.exists()
+    assert list(read_jsonl(gz_path)) == rows
+
+    write_jsonl(path, rows)
+
+    assert not gz_path.exists()
+    assert list(read_jsonl(path)) == rows
+
+
+def test_row_adapter_maps_missing_json_to_empty_object():
+    for table, config in TABLE_CONFIG.items():
+        columns = config["columns"]
+        adapt = make_row_adapter(columns, config["json_fields"])
+
+        out = adapt(dict.fromkeys(columns))
+
+        assert len(out) == len(columns), table
+        for column, value in zip(columns, out, strict=True):
+            if column in config["json_fields"]:
+                assert isinstance(value, Json) and value.obj == {}, (table, column)
+            else:
+                assert value is None, (table, column)
+
+
+def test_upsert_table_stages_large_loads_and_keeps_last_row_per_key():
+    columns = ["factor_id", "factor_text", "source_payload"]
+    rows = [
+        {"factor_id": f"id-{idx % 50}", "factor_text": f"text {idx}", "source_payload": None}
+        for idx in range(COPY_THRESHOLD + 10)
+    ]
+    conn = FakeConnection()
+
+    count = upsert_table(conn, "guideline_factors", rows, columns, {"source_payload"})
+
+    assert count == len(rows)
+    assert conn.commits == 1
+    assert conn.statements[0].startswith("CREATE TEMP TABLE stg_guideline_factors")
+    assert "_load_seq bigserial" in conn.statements[1]
+    assert conn.statements[2].startswith("COPY stg_guideline_factors (")
+    assert "ON CONFLICT (factor_id) DO UPDATE" in conn.statements[3]
+    last_text = {row["factor_id"]: row["factor_text"] for row in rows}
+    assert {key: row[1] for key, row in conn.table.items()} == last_text
+
+
+def test_upsert_table_uses_executemany_below_copy_threshold():
+    columns = ["factor_id", "factor_text", "source_payload"]
+    rows = [{"factor_id": "a", "factor_text": "first"}, {"factor_id": "a", "factor_text": "second"}]
+    conn = FakeConnection()
+
+    assert upsert_table(conn, "guideline_factors", rows, columns, {"source_payload"}) == 2
+    assert len(conn.statements) == 1
+    assert conn.statements[0].startswith("INSERT INTO guideline_factors")
+    assert conn.table["a"][1] == "second"
+
+
+def _write_parquet(path, rows):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    pq.write_table(pa.Table.from_pylist(rows), path)
+
+
+def test_read_parquet_yields_dict_rows_with_struct_keys_filled(tmp_path):
+    path = tmp_path / "source_versions.parquet"
+    _write_parquet(
+        path,
+        [
+            {"source_version_id": "a", "metadata": {"rows": 3, "note": "full"}},
+            {"source_version_id": "b", "metadata": {"rows": 5}},
+        ],
+    )
+
+    assert list(read_parquet(path, batch_size=1)) == [
+        {"source_version_id": "a", "metadata": {"rows": 3, "note": "full"}},
+        {"source_version_id": "b", "metadata": {"rows": 5, "note": None}},
+    ]
+
+
+@pytest.mark.parametrize(
+    ("present", "expected"),
+    [
+        ((".jsonl", ".jsonl.gz", ".parquet"), "jsonl"),
+        ((".jsonl.gz", ".parquet"), "jsonl.gz"),
+        ((".parquet",), "parquet"),
+    ],
+)
+def test_load_table_prefers_jsonl_then_gzip_then_parquet(tmp_path, monkeypatch, present, expected):
+    table = "source_versions"
+    for ext in present:
+        path = tmp_path / f"{table}{ext}"
+        row = {"source_version_id": ext.lstrip(".")}
+        if ext == ".parquet":
+            _write_parquet(path, [row])
+        else:
+            # Written directly: write_jsonl would remove the other JSONL variant.
+            opener = gzip.open if ext == ".jsonl.gz" else open
+            with opener(path, "wt", encoding="utf-8") as handle:
+                handle.write(json.dumps(row) + "\n")
+    loaded = []
+    monkeypatch.setattr(
+        load_to_postgres,
+        "upsert_table",
+        lambda conn, table, rows, columns, json_fields: loaded.extend(rows) or len(loaded),
+    )
+
+    assert load_table(None, tmp_path, table) == 1
+    assert loaded == [{"source_version_id": expected}]
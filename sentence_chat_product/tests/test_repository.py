@@ -0,0 +1,225 @@
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime
+
+import psycopg
+
+from sentence_chat_product.api.main import flush_audit_periodically
+from sentence_chat_product.db import repository
+from sentence_chat_product.db.repository import Repository, _LruCache
+
+
+class FakeAuditConnection:
+    """Inserts audit rows into ``written``; rows whose offence is in ``bad`` violate the FK."""
+
+    def __init__(self, bad=()):
+        self.bad = set(bad)
+        self.written = []
+
+    def _insert(self, rows):
+        rows = list(rows)
+        if any(row[0] in self.bad for row in rows):
+            raise psycopg.errors.ForeignKeyViolation("offence_id not in offence_catalog")
+        self.written.extend(rows)
+
+    @contextmanager
+    def cursor(self):
+        conn = self
+
+        class Cursor:
+            def executemany(self, sql, rows):
+                conn._insert(rows)
+
+        yield Cursor()
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    def execute(self, sql, row):
+        self._insert([row])
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class AuditRepository(Repository):
+    def __init__(self, conn=None, **kwargs):
+        super().__init__("postgresql://unused", audit_batch_size=100, **kwargs)
+        self.conn = conn
+
+    @contextmanager
+    def connect(self):
+        if self.conn is None:
+            raise psycopg.OperationalError("database unavailable")
+        yield self.conn
+
+
+def test_flush_audit_requeues_rows_when_database_is_unreachable():
+    repo = AuditRepository()
+    repo.store_calculation_audit(None, {"n": 1}, {"ok": True})
+    repo.store_calculation_audit(None, {"n": 2}, {"ok": True})
+
+    assert repo.flush_audit() == 0
+    assert [row[1].obj for row in repo._audit_buffer] == [{"n": 1}, {"n": 2}]
+
+    repo.conn = FakeAuditConnection()
+    assert repo.flush_audit() == 2
+    assert not repo._audit_buffer
+
+
+def test_flush_audit_drops_only_rows_that_fail_on_their_own():
+    conn = FakeAuditConnection(bad={"deleted-offence"})
+    repo = AuditRepository(conn)
+    repo.store_calculation_audit("kept-1", {"n": 1}, {"ok": True})
+    repo.store_calculation_audit("deleted-offence", {"n": 2}, {"ok": True})
+    repo.store_calculation_audit("kept-2", {"n": 3}, {"ok": True})
+
+    assert repo.flush_audit() == 2
+    assert [row[0] for row in conn.written] == ["kept-1", "kept-2"]
+    assert not repo._audit_buffer
+
+
+def test_audit_buffer_drops_oldest_rows_beyond_cap():
+    repo = AuditRepository(audit_buffer_max=2)
+    for n in range(3):
+        repo.store_calculation_audit(None, {"n": n}, {"ok": True})
+
+    assert [row[1].obj for row in repo._audit_buffer] == [{"n": 1}, {"n": 2}]
+
+
+def test_audit_rows_carry_request_time():
+    conn = FakeAuditConnection()
+    repo = AuditRepository(conn)
+    before = datetime.now(repository.UTC)
+    repo.store_calculation_audit(None, {"n": 1}, {"ok": True})
+
+    repo.flush_audit()
+
+    assert before <= conn.written[0][3] <= datetime.now(repository.UTC)
+
+
+def test_periodic_flush_runs_without_new_writes():
+    class Repo:
+        audit_flush_interval_s = 0.01
+        flushes = 0
+
+        def flush_audit(self):
+            self.flushes += 1
+
+    async def run(repo):
+        task = asyncio.create_task(flush_audit_periodically(repo))
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+    repo = Repo()
+    asyncio.run(run(repo))
+
+    assert repo.flushes >= 2
+
+
+def test_lru_cache_expires_entries_after_ttl():
+    now = [100.0]
+    cache = _LruCache(max_size=4, ttl_s=10.0, clock=lambda: now[0])
+    cache.put("a", 1)
+
+    now[0] = 110.0
+    assert cache.get("a") == 1
+    now[0] = 110.5
+    assert cache.get("a") is None
+    assert cache.stats() == {"size": 0, "hits": 1, "misses": 1}
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = _LruCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_invalidate_one_key_or_all():
+    cache = _LruCache(max_size=4)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.invalidate()
+    assert cache.get("b") is None
+
+
+class CountingReadRepository(Repository):
+    """Serves one catalog row and one matrix row, counting round trips."""
+
+    def __init__(self, **kwargs):
+        super().__init__("postgresql://unused", **kwargs)
+        self.queries = 0
+
+    @contextmanager
+    def connect(self):
+        repo = self
+
+        class Cursor:
+            def __enter__(self):
+                repo.queries += 1
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params):
+                pass
+
+            def fetchone(self):
+                return {
+                    "offence_id": "00000000-0000-0000-0000-000000000001",
+                    "canonical_name": "Theft",
+                    "short_name": "Theft",
+                }
+
+            def stream(self, sql, params):
+                return iter([{"matrix_id": "m1", "culpability": "A"}])
+
+        class Conn:
+            def cursor(self):
+                return Cursor()
+
+        yield Conn()
+
+
+def test_offence_cache_entry_expires_after_ttl():
+    now = [0.0]
+    repo = CountingReadRepository(offence_cache_ttl_s=60.0, cache_clock=lambda: now[0])
+
+    repo.fetch_offence_by_id("00000000-0000-0000-0000-000000000001")
+    now[0] = 60.0
+    repo.fetch_offence_by_id("00000000-0000-0000-0000-000000000001")
+    assert repo.queries == 1
+
+    now[0] = 60.5
+    repo.fetch_offence_by_id("00000000-0000-0000-0000-000000000001")
+    assert repo.queries == 2
+
+
+def test_sentencing_matrix_callers_cannot_mutate_cache():
+    repo = CountingReadRepository()
+
+    first = repo.fetch_sentencing_matrix("o1")
+    first[0]["culpability"] = "edited"
+    first.append({"matrix_id": "extra"})
+    second = repo.fetch_sentencing_matrix("o1")
+    second[0]["culpability"] = "edited again"
+
+    assert repo.fetch_sentencing_matrix("o1") == [{"matrix_id": "m1", "culpability": "A"}]
+    assert repo.queries == 1
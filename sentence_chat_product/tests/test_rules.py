@@ -1,10 +1,23 @@
+import dataclasses
 from datetime import date
 
 import pytest
 
 from sentence_chat_product.core.calculator import calculate_sentence
-from sentence_chat_product.core.rules import minimum_sentence_decision, release_decision, victim_surcharge
-from sentence_chat_product.core.types import OffenceRecord, SentenceCalculationInput
+from sentence_chat_product.core.rules import (
+    minimum_sentence_decision,
+    release_decision,
+    sentence_after_plea,
+    victim_surcharge,
+)
+from sentence_chat_product.core.types import (
+    F_LIFE_MAX,
+    F_SCH19ZA,
+    F_SEXUAL,
+    F_VIOLENT,
+    OffenceRecord,
+    SentenceCalculationInput,
+)
 
 
 def make_offence(**overrides):
@@ -59,6 +72,16 @@ def test_minimum_sentence_a_triggered():
     assert decision.floor_post_months == pytest.approx(28.8)
 
 
+def test_minimum_sentence_code_normalized_on_record():
+    offence = make_offence(minimum_sentence_code=" a ")
+    decision = minimum_sentence_decision(
+        make_input(offence=offence, prior_domestic_burglary_count=2)
+    )
+
+    assert offence.minimum_sentence_code == "A"
+    assert decision.triggered is True
+
+
 def test_minimum_sentence_c1_no_plea_below_floor():
     data = make_input(
         offence=make_offence(minimum_sentence_code="C1"),
@@ -86,6 +109,52 @@ def test_release_bug_mode_for_forty_percent_regime():
     assert decision.release_fraction == 0.5
 
 
+def test_offence_flags_packed_from_markers():
+    offence = make_offence(schedule19za=True)
+    assert offence.flags & F_VIOLENT
+    assert offence.flags & F_SCH19ZA
+    assert offence.flags & F_LIFE_MAX
+    assert not offence.flags & F_SEXUAL
+
+    decision = release_decision(make_input(offence=offence), post_plea_term_months=16)
+    assert decision.release_fraction == pytest.approx(2.0 / 3.0)
+
+
+def test_offence_record_is_frozen_and_replace_recomputes_flags():
+    offence = make_offence(schedule19za=False)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        offence.schedule19za = True
+
+    updated = dataclasses.replace(offence, schedule19za=True)
+    assert not offence.flags & F_SCH19ZA
+    assert updated.flags & F_SCH19ZA
+
+
+def test_release_fn_compiled_with_offence_and_rebuilt_on_replace():
+    offence = make_offence(specified_violent=False, maximum_sentence_amount="10 years")
+    compiled = offence.release_fn
+    first = release_decision(make_input(offence=offence), post_plea_term_months=16)
+    second = release_decision(
+        make_input(offence=offence, terrorism_flag=True), post_plea_term_months=16
+    )
+    updated = dataclasses.replace(offence, schedule19za=True)
+    third = release_decision(make_input(offence=updated), post_plea_term_months=16)
+
+    assert offence.release_fn is compiled
+    assert updated.release_fn is not compiled
+    assert first.release_fraction == 0.5
+    assert second.release_fraction == pytest.approx(2.0 / 3.0)
+    assert third.release_fraction == pytest.approx(2.0 / 3.0)
+
+
+def test_sentence_after_plea_rounds_to_two_places():
+    assert sentence_after_plea(10, "first_stage") == 6.67
+    assert sentence_after_plea(13, "day_of_trial") == 11.7
+    assert sentence_after_plea(12, "unknown_stage") == 12
+    assert sentence_after_plea(None, "first_stage") is None
+
+
 def test_victim_surcharge_2022_adult_fine():
     amount = victim_surcharge(
         offence_date=date(2024, 1, 1),
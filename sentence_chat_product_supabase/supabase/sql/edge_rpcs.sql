@@ -184,9 +184,67 @@ returns table (
   text_score real,
   score real
 )
-language sql
-stable
+language plpgsql
+volatile
 as $$
+#variable_conflict use_column
+declare
+  v_iterative boolean;
+begin
+  -- HNSW scans yield at most hnsw.ef_search rows (default 40) before the offence
+  -- scope filters them, so widen it to the candidate count for this transaction.
+  perform set_config('hnsw.ef_search', least(greatest(p_top_k * 4, 40), 1000)::text, true);
+
+  -- pgvector >= 0.8 can keep scanning until enough rows pass the filter.
+  select coalesce(bool_or(string_to_array(extversion, '.')::int[] >= array[0, 8]), false)
+  into v_iterative
+  from pg_extension
+  where extname = 'vector';
+  if v_iterative then
+    perform set_config('hnsw.iterative_scan', 'relaxed_order', true);
+  end if;
+
+  return query
+  with q as (
+    select plainto_tsquery('english', p_query) as tsq
+  ),
+  scope as not materialized (
+    select gc.chunk_id, gc.embedding, gc.tsv
+    from guideline_chunks gc
+    where (
+      p_offence_id is null
+      or gc.offence_id = p_offence_id
+      or gc.guideline_id in (
+        select guideline_id from offence_guideline_links where offence_id = p_offence_id
+      )
+    )
+  ),
+  vector_candidates as (
+    (
+      select s.chunk_id
+      from scope s
+      where (p_offence_id is null or v_iterative) and s.embedding is not null
+      order by s.embedding <=> p_query_embedding
+      limit p_top_k * 4
+    )
+    union all
+    (
+      -- Older pgvector with an offence filter: "+ 0" keeps the planner off the
+      -- HNSW index so the scope is ranked exactly.
+      select s.chunk_id
+      from scope s
+      where p_offence_id is not null and not v_iterative and s.embedding is not null
+      order by (s.embedding <=> p_query_embedding) + 0
+      limit p_top_k * 4
+    )
+  ),
+  text_candidates as (
+    select s.chunk_id
+    from scope s, q
+    where s.tsv @@ q.tsq
+    order by ts_rank_cd(s.tsv, q.tsq) desc
+    limit p_top_k * 4
+  )
   select
     gc.chunk_id::text,
     gc.guideline_id::text,
@@ -196,21 +254,20 @@ as $$
     gc.chunk_text,
     gc.source_url,
     coalesce(1 - (gc.embedding <=> p_query_embedding), 0)::real as vector_score,
-    ts_rank_cd(gc.tsv, plainto_tsquery('english', p_query))::real as text_score,
+    ts_rank_cd(gc.tsv, q.tsq)::real as text_score,
     (
       coalesce(1 - (gc.embedding <=> p_query_embedding), 0) * 0.75
-      + ts_rank_cd(gc.tsv, plainto_tsquery('english', p_query)) * 0.25
+      + ts_rank_cd(gc.tsv, q.tsq) * 0.25
     )::real as score
-  from guideline_chunks gc
-  where (
-    p_offence_id is null
-    or gc.offence_id = p_offence_id
-    or gc.guideline_id in (
-      select guideline_id from offence_guideline_links where offence_id = p_offence_id
-    )
+  from guideline_chunks gc, q
+  where gc.chunk_id in (
+    select chunk_id from vector_candidates
+    union
+    select chunk_id from text_candidates
   )
   order by score desc
   limit p_top_k;
+end;
 $$;
 
 create or replace function api_store_calculation_audit(
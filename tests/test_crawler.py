@@ -17,22 +17,23 @@ class DummyResponse:
 
 
 class CrawlerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Parsed once; the extractors below only read from the tree.
+        cls.index_html = (FIXTURES / "magistrates_index.html").read_text(encoding="utf-8")
+        cls.index_soup = BeautifulSoup(cls.index_html, "lxml")
+
     def test_extract_guideline_data_json(self):
-        html = (FIXTURES / "magistrates_index.html").read_text(encoding="utf-8")
-        soup = BeautifulSoup(html, "lxml")
         crawler = SentencingCrawler()
 
-        data = crawler._extract_guideline_data_json(soup)
+        data = crawler._extract_guideline_data_json(self.index_soup)
         self.assertEqual(len(data), 2)
         self.assertEqual(data[0]["name"], "Test offence A")
         self.assertEqual(data[1]["url"], "/guidelines/test-offence-b/")
 
     def test_extract_tab_links(self):
-        html = (FIXTURES / "magistrates_index.html").read_text(encoding="utf-8")
-        soup = BeautifulSoup(html, "lxml")
-
         links = extract_tab_links(
-            soup, "https://example.test/guidelines/magistrates/", "magistrates"
+            self.index_soup, "https://example.test/guidelines/magistrates/", "magistrates"
         )
         names = [l.name for l in links]
         tabs = {l.name: l.source_tab for l in links}
@@ -45,9 +46,8 @@ class CrawlerTests(unittest.TestCase):
         self.assertEqual(tabs["Ancillary orders"], "Supplementary information")
 
     def test_discover_offences_from_index_uses_fixture(self):
-        html = (FIXTURES / "magistrates_index.html").read_text(encoding="utf-8")
         crawler = SentencingCrawler()
-        crawler._polite_get = lambda url: DummyResponse(html)  # stub network
+        crawler._polite_get = lambda url: DummyResponse(self.index_html)  # stub network
 
         links = crawler.discover_offences_from_index(
             "https://example.test/guidelines/magistrates/", "magistrates"